@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from benchmarks import (
+    import_time,
+    jwt_service,
+    metrics,
+    password_service,
+    session_codec,
+    session_repository,
+    value_objects,
+)
+from benchmarks.harness import BenchmarkOptions, BenchmarkResult
+
+# Benchmarks write sessions and revocation events, so they only use a
+# throwaway local database unless another one is given explicitly
+DEFAULT_REDIS_URL = "redis://127.0.0.1:6379/15"
+
+SUITES: Dict[str, Callable[[BenchmarkOptions], Awaitable[List[BenchmarkResult]]]] = {
+    "jwt_service": jwt_service.run,
+    "session_repository": session_repository.run,
+    "password_service": password_service.run,
+    "value_objects": value_objects.run,
+    "session_codec": session_codec.run,
+    "metrics": metrics.run,
+    "import_time": import_time.run,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Auth hot path benchmarks")
+    parser.add_argument("suites", nargs="*", help=f"Any of: {', '.join(SUITES)}")
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument(
+        "--redis-url",
+        default=DEFAULT_REDIS_URL,
+        help=(
+            "Redis the repository benchmarks write to, never the REDIS_* "
+            f"settings (default: {DEFAULT_REDIS_URL})"
+        ),
+    )
+    parser.add_argument("--output", type=Path, help="Save results as JSON")
+    parser.add_argument("--compare", type=Path, help="Compare with saved results")
+    return parser.parse_args()
+
+
+async def run_suites(
+    names: List[str], options: BenchmarkOptions
+) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+    for name in names:
+        results.extend(await SUITES[name](options))
+    return results
+
+
+def print_results(
+    results: List[BenchmarkResult], baseline: Optional[Dict[str, Any]]
+) -> None:
+    header: str = (
+        f"{'benchmark':<56} {'ops/sec':>12} {'p50, us':>10} "
+        f"{'p99, us':>10} {'alloc, B':>9} {'held, B':>8}"
+    )
+    if baseline is not None:
+        header += f" {'vs base':>8}"
+    print(header)
+
+    for result in results:
+        if result.skipped is not None:
+            print(f"{result.name:<56} skipped: {result.skipped}")
+            continue
+        line: str = (
+            f"{result.name:<56} {result.ops_per_sec:>12,.0f} "
+            f"{result.p50_us:>10.2f} {result.p99_us:>10.2f} "
+            f"{result.alloc_bytes:>9} {result.retained_bytes:>8}"
+        )
+        if baseline is not None and result.name in baseline:
+            base_ops: float = baseline[result.name]["ops_per_sec"]
+            # Skipped in the baseline run, nothing to compare with
+            if base_ops:
+                line += f" {(result.ops_per_sec / base_ops - 1) * 100:>+7.1f}%"
+        print(line)
+
+
+def main() -> None:
+    args: argparse.Namespace = parse_args()
+    unknown: List[str] = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        sys.exit(f"Unknown benchmark suites: {', '.join(unknown)}")
+
+    options = BenchmarkOptions(
+        iterations=args.iterations,
+        warmup=args.warmup,
+        redis_url=args.redis_url,
+    )
+
+    baseline: Optional[Dict[str, Any]] = None
+    if args.compare:
+        saved: Dict[str, Any] = json.loads(args.compare.read_text())
+        baseline = {result["name"]: result for result in saved["results"]}
+
+    results: List[BenchmarkResult] = asyncio.run(
+        run_suites(args.suites or list(SUITES), options)
+    )
+    print_results(results, baseline)
+
+    if args.output:
+        report: Dict[str, Any] = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "iterations": options.iterations,
+            "results": [result.to_dict() for result in results],
+        }
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
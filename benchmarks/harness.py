@@ -0,0 +1,145 @@
+import gc
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Allocation tracing is slow, so it runs on a separate, shorter pass
+ALLOCATION_SAMPLES = 200
+
+
+@dataclass
+class BenchmarkOptions:
+    iterations: int = 10_000
+    warmup: int = 100
+    redis_url: Optional[str] = None
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    alloc_bytes: int  # median peak traced memory per operation
+    retained_bytes: int  # median traced memory still held by the result
+    extra: Dict[str, Any] = field(default_factory=dict)
+    skipped: Optional[str] = None  # why it didn't run, numbers are zero then
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def skip(name: str, reason: str) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        iterations=0,
+        ops_per_sec=0.0,
+        p50_us=0.0,
+        p99_us=0.0,
+        alloc_bytes=0,
+        retained_bytes=0,
+        skipped=reason,
+    )
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    options: BenchmarkOptions,
+    iterations: Optional[int] = None,
+    **extra: Any,
+) -> BenchmarkResult:
+    iterations = iterations or options.iterations
+    for _ in range(min(options.warmup, iterations)):
+        func()
+
+    timings: List[int] = []
+    gc.collect()
+    for _ in range(iterations):
+        started: int = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - started)
+
+    allocations: List[int] = []
+    retained: List[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(ALLOCATION_SAMPLES, iterations)):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            result: Any = func()
+            current, peak = tracemalloc.get_traced_memory()
+            allocations.append(peak - baseline)
+            retained.append(current - baseline)
+            del result
+    finally:
+        tracemalloc.stop()
+
+    return _build_result(name, timings, allocations, retained, extra)
+
+
+async def measure_async(
+    name: str,
+    func: Callable[[], Awaitable[Any]],
+    options: BenchmarkOptions,
+    iterations: Optional[int] = None,
+    **extra: Any,
+) -> BenchmarkResult:
+    iterations = iterations or options.iterations
+    for _ in range(min(options.warmup, iterations)):
+        await func()
+
+    timings: List[int] = []
+    gc.collect()
+    for _ in range(iterations):
+        started: int = time.perf_counter_ns()
+        await func()
+        timings.append(time.perf_counter_ns() - started)
+
+    allocations: List[int] = []
+    retained: List[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(ALLOCATION_SAMPLES, iterations)):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            result: Any = await func()
+            current, peak = tracemalloc.get_traced_memory()
+            allocations.append(peak - baseline)
+            retained.append(current - baseline)
+            del result
+    finally:
+        tracemalloc.stop()
+
+    return _build_result(name, timings, allocations, retained, extra)
+
+
+def _build_result(
+    name: str,
+    timings: List[int],
+    allocations: List[int],
+    retained: List[int],
+    extra: Dict[str, Any],
+) -> BenchmarkResult:
+    timings.sort()
+    total_seconds: float = sum(timings) / 1e9
+    return BenchmarkResult(
+        name=name,
+        iterations=len(timings),
+        ops_per_sec=len(timings) / total_seconds if total_seconds else 0.0,
+        p50_us=_percentile(timings, 50) / 1e3,
+        p99_us=_percentile(timings, 99) / 1e3,
+        alloc_bytes=int(statistics.median(allocations)) if allocations else 0,
+        retained_bytes=int(statistics.median(retained)) if retained else 0,
+        extra=extra,
+    )
+
+
+def _percentile(sorted_values: List[int], percent: float) -> float:
+    index: int = min(
+        len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1))
+    )
+    return float(sorted_values[index])
@@ -0,0 +1,60 @@
+import json
+import subprocess
+import sys
+from dataclasses import replace
+from functools import partial
+from typing import List
+
+from benchmarks.harness import BenchmarkOptions, BenchmarkResult, measure
+
+# Every sample is a fresh interpreter, so far fewer of them
+MAX_ITERATIONS = 20
+
+# Dependencies that should only load when something actually needs them
+HEAVY_MODULES = ("aioredis", "bcrypt", "fastapi", "jwt", "sqlalchemy")
+
+CASES = {
+    "import_time.infrastructure": "import auth_service.infrastructure",
+    "import_time.load_config": (
+        "from auth_service.core.configurations import load_config; load_config()"
+    ),
+    "import_time.main": "import auth_service.main",
+}
+
+
+def _run(statement: str) -> str:
+    completed = subprocess.run(
+        [sys.executable, "-c", statement], capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{completed.stderr}")
+    return completed.stdout
+
+
+def _loaded_modules(statement: str) -> List[str]:
+    probe: str = (
+        f"{statement}\n"
+        "import json, sys\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    loaded: List[str] = json.loads(_run(probe))
+    return loaded
+
+
+async def run(options: BenchmarkOptions) -> List[BenchmarkResult]:
+    # The first run also compiles bytecode, the rest measure a warm cache
+    cold_start: BenchmarkOptions = replace(
+        options, iterations=min(options.iterations, MAX_ITERATIONS), warmup=1
+    )
+
+    results: List[BenchmarkResult] = []
+    for name, statement in CASES.items():
+        results.append(
+            measure(
+                name,
+                partial(_run, statement),
+                cold_start,
+                loaded_modules=_loaded_modules(statement),
+            )
+        )
+    return results
@@ -0,0 +1,61 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import jwt as pyjwt
+
+from auth_service.core.configurations import JWTConfig
+from auth_service.domain.value_objects import JTI, Session, UserId
+from auth_service.infrastructure.security.jwt_service import JWTService
+from auth_service.infrastructure.security.token_cache import TokenCache
+from benchmarks.harness import (
+    BenchmarkOptions,
+    BenchmarkResult,
+    measure,
+    measure_async,
+)
+from benchmarks.stubs import InMemorySessionRepository
+
+SECRET_KEY = "benchmark-secret-key-0123456789abcdef"
+
+
+async def run(options: BenchmarkOptions) -> List[BenchmarkResult]:
+    config: JWTConfig = JWTConfig(secret_key=SECRET_KEY)
+    repository: InMemorySessionRepository = InMemorySessionRepository()
+    service: JWTService = JWTService(config, repository)
+    cached_service: JWTService = JWTService(
+        config, repository, token_cache=TokenCache()
+    )
+
+    user_id: UserId = UserId(uuid.uuid4())
+    jti: JTI = JTI(str(uuid.uuid4()))
+    now: datetime = datetime.now(timezone.utc)
+    await repository.add(Session(jti, user_id, now, now + timedelta(hours=1)))
+    token: str = service.create_access_token(user_id, jti)
+    claims: Dict[str, Any] = pyjwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+
+    return [
+        measure(
+            "jwt_service.create_access_token",
+            lambda: service.create_access_token(user_id, jti),
+            options,
+        ),
+        await measure_async(
+            "jwt_service.issue_token_pair",
+            lambda: service.issue_token_pair(user_id),
+            options,
+        ),
+        measure(
+            "jwt_service.parse_payload",
+            lambda: service._parse_payload_values(claims),
+            options,
+        ),
+        await measure_async(
+            "jwt_service.decode_token", lambda: service.decode_token(token), options
+        ),
+        await measure_async(
+            "jwt_service.decode_token[cached]",
+            lambda: cached_service.decode_token(token),
+            options,
+        ),
+    ]
@@ -0,0 +1,44 @@
+from typing import List
+
+from auth_service.infrastructure.metrics.registry import (
+    MetricsRegistry,
+    observe,
+    observe_async,
+)
+from benchmarks.harness import (
+    BenchmarkOptions,
+    BenchmarkResult,
+    measure,
+    measure_async,
+)
+
+
+async def run(options: BenchmarkOptions) -> List[BenchmarkResult]:
+    # A private registry keeps benchmark samples out of the exported metrics
+    registry = MetricsRegistry()
+    histogram = registry.histogram("benchmark_seconds", "Benchmark", ["operation"])
+    counter = registry.counter("benchmark_total", "Benchmark", ["operation"])
+    observed = histogram.labels("observe")
+    incremented = counter.labels("inc")
+
+    def plain() -> int:
+        return 1
+
+    async def plain_async() -> int:
+        return 1
+
+    timed = observe(histogram.labels("sync"))(plain)
+    timed_async = observe_async(histogram.labels("async"))(plain_async)
+
+    for _ in range(1000):
+        observed.observe(0.001)
+
+    return [
+        measure("metrics.histogram_observe", lambda: observed.observe(0.001), options),
+        measure("metrics.counter_inc", lambda: incremented.inc(), options),
+        measure("metrics.call_plain", plain, options),
+        measure("metrics.call_observed", timed, options),
+        await measure_async("metrics.call_plain_async", plain_async, options),
+        await measure_async("metrics.call_observed_async", timed_async, options),
+        measure("metrics.render", registry.render, options, iterations=1000),
+    ]
@@ -0,0 +1,37 @@
+from typing import List
+
+from auth_service.core.configurations import PasswordConfig
+from auth_service.infrastructure.security.password_service import PasswordService
+from benchmarks.harness import BenchmarkOptions, BenchmarkResult, measure
+
+COST_FACTORS = (4, 8, 10, 12)
+PASSWORD = "correct horse battery staple"
+
+
+async def run(options: BenchmarkOptions) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+    for rounds in COST_FACTORS:
+        service: PasswordService = PasswordService(PasswordConfig(rounds=rounds))
+        hashed: str = service.hash_password(PASSWORD)
+        # Every extra round doubles the cost, keep slow factors short
+        iterations: int = max(5, min(options.iterations, 2 ** (16 - rounds)))
+
+        results.append(
+            measure(
+                f"password_service.hash[{rounds}]",
+                lambda: service.hash_password(PASSWORD),
+                options,
+                iterations=iterations,
+                rounds=rounds,
+            )
+        )
+        results.append(
+            measure(
+                f"password_service.verify[{rounds}]",
+                lambda: service.verify_password(PASSWORD, hashed),
+                options,
+                iterations=iterations,
+                rounds=rounds,
+            )
+        )
+    return results
@@ -0,0 +1,55 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from auth_service.domain.value_objects import JTI, Session, UserId
+from auth_service.infrastructure.redis.session_codec import (
+    BinarySessionCodec,
+    JSONSessionCodec,
+    SessionCodec,
+)
+from benchmarks.harness import BenchmarkOptions, BenchmarkResult, measure
+
+
+def make_session() -> Session:
+    now: datetime = datetime.now(timezone.utc)
+    return Session(
+        jti=JTI(str(uuid.uuid4())),
+        user_id=UserId(uuid.uuid4()),
+        created_at=now,
+        expires_at=now + timedelta(days=7),
+        device_info="iPhone 15 Pro",
+        ip_address="203.0.113.42",
+        user_agent="Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X)",
+    )
+
+
+async def run(options: BenchmarkOptions) -> List[BenchmarkResult]:
+    session: Session = make_session()
+    codecs: List[Tuple[str, SessionCodec]] = [
+        ("json", JSONSessionCodec()),
+        ("binary", BinarySessionCodec()),
+    ]
+
+    results: List[BenchmarkResult] = []
+    for name, codec in codecs:
+        data: bytes = codec.encode(session)
+        assert codec.decode(data, session.jti) == session
+
+        results.append(
+            measure(
+                f"session_codec.{name}.encode",
+                lambda: codec.encode(session),
+                options,
+                bytes=len(data),
+            )
+        )
+        results.append(
+            measure(
+                f"session_codec.{name}.decode",
+                lambda: codec.decode(data, session.jti),
+                options,
+                bytes=len(data),
+            )
+        )
+    return results
@@ -0,0 +1,94 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import aioredis
+from aioredis import Redis
+
+from auth_service.domain.value_objects import JTI, Session, UserId
+from auth_service.infrastructure.redis.session_repository import RedisSessionRepository
+from benchmarks.harness import BenchmarkOptions, BenchmarkResult, measure_async, skip
+
+SESSIONS_PER_USER = 50
+# Benchmark data expires on its own instead of being flushed
+SESSION_LIFETIME = timedelta(minutes=5)
+# Every iteration talks to Redis, keep the run short
+MAX_ITERATIONS = 2000
+
+BENCHMARKS = [
+    "session_repository.add",
+    "session_repository.get_session",
+    f"session_repository.get_sessions_by_user_id[{SESSIONS_PER_USER}]",
+    "session_repository.revoke_session",
+    f"session_repository.revoke_all_sessions[{SESSIONS_PER_USER}]",
+]
+
+
+def make_session(user_id: UserId) -> Session:
+    now: datetime = datetime.now(timezone.utc)
+    return Session(
+        jti=JTI(str(uuid.uuid4())),
+        user_id=user_id,
+        created_at=now,
+        expires_at=now + SESSION_LIFETIME,
+        device_info="iPhone 15 Pro",
+        ip_address="203.0.113.42",
+    )
+
+
+async def run(options: BenchmarkOptions) -> List[BenchmarkResult]:
+    if not options.redis_url:
+        return [skip(name, "no Redis URL") for name in BENCHMARKS]
+
+    redis: Redis = aioredis.from_url(options.redis_url)
+    try:
+        await redis.ping()
+    except Exception as e:
+        await redis.close()
+        return [skip(name, f"Redis is unavailable: {e}") for name in BENCHMARKS]
+
+    repository: RedisSessionRepository = RedisSessionRepository(redis)
+    iterations: int = min(options.iterations, MAX_ITERATIONS)
+    user_id: UserId = UserId(uuid.uuid4())
+    sessions: List[Session] = [
+        make_session(user_id) for _ in range(SESSIONS_PER_USER)
+    ]
+    for session in sessions:
+        await repository.add(session)
+    jti: JTI = sessions[0].jti
+
+    try:
+        return [
+            await measure_async(
+                BENCHMARKS[0],
+                lambda: repository.add(make_session(UserId(uuid.uuid4()))),
+                options,
+                iterations=iterations,
+            ),
+            await measure_async(
+                BENCHMARKS[1],
+                lambda: repository.get_session(jti),
+                options,
+                iterations=iterations,
+            ),
+            await measure_async(
+                BENCHMARKS[2],
+                lambda: repository.get_sessions_by_user_id(user_id),
+                options,
+                iterations=iterations,
+            ),
+            await measure_async(
+                BENCHMARKS[3],
+                lambda: repository.revoke_session(jti),
+                options,
+                iterations=iterations,
+            ),
+            await measure_async(
+                BENCHMARKS[4],
+                lambda: repository.revoke_all_sessions(user_id),
+                options,
+                iterations=iterations,
+            ),
+        ]
+    finally:
+        await redis.close()
@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import UUID
+
+from auth_service.domain.value_objects import JTI, Session, UserId, Username
+from benchmarks.harness import BenchmarkOptions, BenchmarkResult, measure
+
+
+async def run(options: BenchmarkOptions) -> List[BenchmarkResult]:
+    jti_value: str = str(uuid.uuid4())
+    user_uuid: UUID = uuid.uuid4()
+    jti: JTI = JTI(jti_value)
+    user_id: UserId = UserId(user_uuid)
+    now: datetime = datetime.now(timezone.utc)
+    expires_at: datetime = now + timedelta(hours=1)
+
+    return [
+        measure("value_objects.jti", lambda: JTI(jti_value), options),
+        measure("value_objects.username", lambda: Username("john_doe-42"), options),
+        measure("value_objects.user_id", lambda: UserId(user_uuid), options),
+        measure(
+            "value_objects.session",
+            lambda: Session(
+                jti=jti,
+                user_id=user_id,
+                created_at=now,
+                expires_at=expires_at,
+                device_info="iPhone 15 Pro",
+                ip_address="203.0.113.42",
+            ),
+            options,
+        ),
+        measure("value_objects.jti_hash", lambda: hash(jti), options),
+    ]
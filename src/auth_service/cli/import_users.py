@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, TextIO
+
+from aioredis import Redis
+
+from auth_service.core.configurations import load_config
+from auth_service.infrastructure.cache.bloom_filter import RedisBloomFilter
+from auth_service.infrastructure.cache.user_cache import USERNAME_TEMPLATE, UserCache
+from auth_service.infrastructure.cache.username_filter import (
+    USERNAME_FILTER_GENERATION,
+)
+from auth_service.infrastructure.logging import setup_logging
+from auth_service.infrastructure.postgresql.database.async_database import (
+    AsyncDatabase,
+)
+from auth_service.infrastructure.postgresql.user_importer import (
+    ImportRecord,
+    ImportReport,
+    UserImporter,
+    read_records,
+)
+from auth_service.infrastructure.redis.client import create_redis
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk import users")
+    parser.add_argument("path", type=Path, help="CSV or JSONL file with users")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        help="input format, detected from the file extension by default",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="hashing processes"
+    )
+    parser.add_argument(
+        "--rounds", type=int, help="bcrypt cost, defaults to PASSWORD_ROUNDS"
+    )
+    parser.add_argument(
+        "--rejects", type=Path, help="CSV file for skipped rows and reasons"
+    )
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> ImportReport:
+    config = load_config()
+    file_format: str = args.format or (
+        "jsonl" if args.path.suffix in (".jsonl", ".ndjson") else "csv"
+    )
+
+    rejects_file: Optional[TextIO] = (
+        args.rejects.open("w", encoding="utf-8", newline="") if args.rejects else None
+    )
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+    if rejects_writer is not None:
+        rejects_writer.writerow(["line", "username", "reason"])
+
+    def on_reject(record: ImportRecord, reason: str) -> None:
+        if rejects_writer is not None:
+            rejects_writer.writerow([record.line, record.username, reason])
+
+    filter_config = config.username_filter
+    cache_config = config.user_cache
+    redis: Optional[Redis] = (
+        create_redis(config.redis)
+        if filter_config.enabled
+        or (cache_config.enabled and cache_config.redis_enabled)
+        else None
+    )
+    user_cache: Optional[UserCache] = (
+        UserCache(cache_config, redis)
+        if redis is not None and cache_config.enabled and cache_config.redis_enabled
+        else None
+    )
+    username_filter: Optional[RedisBloomFilter] = (
+        RedisBloomFilter(
+            redis, filter_config.capacity, filter_config.false_positive_rate
+        )
+        if redis is not None and filter_config.backend == "redis"
+        else None
+    )
+
+    async def on_imported(usernames: List[str]) -> None:
+        # Imported users must not look free to the running servers
+        if user_cache is not None:
+            # Drops "not found" entries shared through Redis, per-process
+            # ones expire after USER_CACHE_NEGATIVE_TTL
+            await user_cache.invalidate(
+                *(USERNAME_TEMPLATE.format(username=name) for name in usernames)
+            )
+        if username_filter is not None:
+            await username_filter.add_many(usernames)
+        elif filter_config.enabled and redis is not None:
+            # Local filters live in the server processes, mark them stale
+            await redis.incr(USERNAME_FILTER_GENERATION)
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            async with AsyncDatabase(config.database) as database:
+                importer = UserImporter(
+                    database,
+                    executor,
+                    workers=args.workers,
+                    rounds=args.rounds or config.password.rounds,
+                    batch_size=args.batch_size,
+                    on_reject=on_reject,
+                    on_imported=on_imported,
+                )
+                return await importer.run(read_records(args.path, file_format))
+    finally:
+        if redis is not None:
+            await redis.close()
+            await redis.connection_pool.disconnect()
+        if rejects_file is not None:
+            rejects_file.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args: argparse.Namespace = parse_args(argv)
+    setup_logging(output_to_console=True, log_level="INFO")
+    report: ImportReport = asyncio.run(run(args))
+    print(
+        f"read={report.read} imported={report.imported} "
+        f"duplicates={report.duplicates} invalid={report.invalid}"
+    )
+
+
+if __name__ == "__main__":
+    main()
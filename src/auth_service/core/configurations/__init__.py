@@ -1,16 +1,27 @@
+from auth_service.core.configurations.admission import AdmissionConfig
 from auth_service.core.configurations.app import AppConfig
 from auth_service.core.configurations.base import BaseConfig
 from auth_service.core.configurations.config import Config, load_config
 from auth_service.core.configurations.database import DatabaseConfig
-from auth_service.core.configurations.jwt import JWTConfig
+from auth_service.core.configurations.jwt import JWTConfig, SigningKeyConfig
+from auth_service.core.configurations.logging import LoggingConfig
+from auth_service.core.configurations.password import PasswordConfig
 from auth_service.core.configurations.redis import RedisConfig
+from auth_service.core.configurations.user_cache import UserCacheConfig
+from auth_service.core.configurations.username_filter import UsernameFilterConfig
 
 __all__ = [
+    "AdmissionConfig",
     "AppConfig",
     "BaseConfig",
     "Config",
     "DatabaseConfig",
     "JWTConfig",
+    "LoggingConfig",
+    "PasswordConfig",
     "RedisConfig",
+    "SigningKeyConfig",
+    "UserCacheConfig",
+    "UsernameFilterConfig",
     "load_config",
 ]
@@ -0,0 +1,18 @@
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from auth_service.core.configurations.base import BaseConfig
+
+
+class AdmissionConfig(BaseConfig):
+    enabled: bool = Field(default=False)
+    # Sliding window shared by the per-username and per-IP limits
+    window: int = Field(default=60)  # seconds
+    username_limit: int = Field(default=10)  # attempts per window
+    ip_limit: int = Field(default=100)  # attempts per window
+    # Concurrent password checks across all workers, 0 disables the budget
+    password_concurrency: int = Field(default=64)
+    # Leases of crashed workers are reclaimed after this time
+    lease_ttl: int = Field(default=30)  # seconds
+
+    model_config = SettingsConfigDict(env_prefix="ADMISSION_")
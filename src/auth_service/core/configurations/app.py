@@ -1,7 +1,9 @@
+from typing import Optional
+
 from pydantic import Field
 from pydantic_settings import SettingsConfigDict
 
-from auth_service.core.configurations import BaseConfig
+from auth_service.core.configurations.base import BaseConfig
 
 
 class AppConfig(BaseConfig):
@@ -9,4 +11,16 @@ class AppConfig(BaseConfig):
     port: int = Field(default=8000)
     debug: bool = Field(default=False)
 
+    # Worker processes, defaults to the CPUs available to this process
+    workers: Optional[int] = Field(default=None)
+    backlog: int = Field(default=2048)  # pending connections per socket
+    keep_alive_timeout: int = Field(default=5)  # seconds
+    # Time in-flight requests get to finish on shutdown, seconds
+    graceful_timeout: int = Field(default=30)
+
+    # Shared by the workers of one server for their slots and metrics,
+    # main() creates a temporary one when it starts several workers
+    runtime_directory: Optional[str] = Field(default=None)
+    metrics_interval: float = Field(default=5.0)  # seconds between snapshots
+
     model_config = SettingsConfigDict(env_prefix="APP_")
@@ -1,10 +1,71 @@
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
+
+from dotenv import dotenv_values
+from pydantic_settings import (
+    BaseSettings,
+    EnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+
+ENV_FILE: str = ".env"
+ENV_FILE_ENCODING: str = "utf-8"
+
+# Set while a whole configuration tree is being built
+_environment: ContextVar[Optional[Dict[str, str]]] = ContextVar(
+    "environment", default=None
+)
+
+
+@contextmanager
+def environment_snapshot() -> Iterator[Dict[str, str]]:
+    # .env is read once, the process environment takes precedence over it.
+    # Keys are lowercased the same way case-insensitive settings expect.
+    environment: Dict[str, str] = {
+        key.lower(): value
+        for key, value in dotenv_values(ENV_FILE, encoding=ENV_FILE_ENCODING).items()
+        if value is not None
+    }
+    environment.update((key.lower(), value) for key, value in os.environ.items())
+
+    token: Token[Optional[Dict[str, str]]] = _environment.set(environment)
+    try:
+        yield environment
+    finally:
+        _environment.reset(token)
 
 
 class BaseConfig(BaseSettings):
     model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
+        env_file=ENV_FILE,
+        env_file_encoding=ENV_FILE_ENCODING,
         case_sensitive=False,
         extra="ignore",
     )
+
+    def __init__(self, **values: Any) -> None:
+        if _environment.get() is not None:
+            # Inside a snapshot the file has already been read
+            values.setdefault("_env_file", None)
+        super().__init__(**values)
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        environment: Optional[Dict[str, str]] = _environment.get()
+        if environment is None or not isinstance(env_settings, EnvSettingsSource):
+            return init_settings, env_settings, dotenv_settings, file_secret_settings
+
+        # Every config in the tree sees the same values, even if the
+        # environment changes while it is being built
+        env_settings.env_vars = environment
+        return init_settings, env_settings, file_secret_settings
@@ -1,21 +1,35 @@
 from functools import lru_cache
 
-from auth_service.core.configurations import (
-    AppConfig,
-    BaseConfig,
-    DatabaseConfig,
-    JWTConfig,
-    RedisConfig,
-)
+from pydantic import Field
+
+from auth_service.core.configurations.admission import AdmissionConfig
+from auth_service.core.configurations.app import AppConfig
+from auth_service.core.configurations.base import BaseConfig, environment_snapshot
+from auth_service.core.configurations.database import DatabaseConfig
+from auth_service.core.configurations.jwt import JWTConfig
+from auth_service.core.configurations.logging import LoggingConfig
+from auth_service.core.configurations.password import PasswordConfig
+from auth_service.core.configurations.redis import RedisConfig
+from auth_service.core.configurations.user_cache import UserCacheConfig
+from auth_service.core.configurations.username_filter import UsernameFilterConfig
 
 
 class Config(BaseConfig):
-    app = AppConfig()
-    database = DatabaseConfig()
-    redis = RedisConfig()
-    jwt = JWTConfig()  # type: ignore
+    app: AppConfig = Field(default_factory=AppConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    database: DatabaseConfig = Field(default_factory=DatabaseConfig)
+    redis: RedisConfig = Field(default_factory=RedisConfig)
+    jwt: JWTConfig = Field(default_factory=JWTConfig)  # type: ignore
+    logging: LoggingConfig = Field(default_factory=LoggingConfig)
+    password: PasswordConfig = Field(default_factory=PasswordConfig)
+    user_cache: UserCacheConfig = Field(default_factory=UserCacheConfig)
+    username_filter: UsernameFilterConfig = Field(
+        default_factory=UsernameFilterConfig
+    )
 
 
 @lru_cache(maxsize=1)
 def load_config() -> Config:
-    return Config()
+    # One pass over .env and the environment for all sub-configs
+    with environment_snapshot():
+        return Config()
@@ -3,7 +3,7 @@ from typing import Any, Dict
 from pydantic import Field, computed_field
 from pydantic_settings import SettingsConfigDict
 
-from auth_service.core.configurations import BaseConfig
+from auth_service.core.configurations.base import BaseConfig
 
 
 class DatabaseConfig(BaseConfig):
@@ -20,16 +20,16 @@ class DatabaseConfig(BaseConfig):
     pool_recycle: int = Field(default=1800)
     echo: bool = Field(default=False)
 
-    @property
     @computed_field
+    @property
     def dsn(self) -> str:
         return (
             f"{self.driver}://{self.user}:{self.password}"
             f"@{self.host}:{self.port}/{self.name}"
         )
 
-    @property
     @computed_field
+    @property
     def engine_options(self) -> Dict[str, Any]:
         return {
             "pool_size": self.pool_size,
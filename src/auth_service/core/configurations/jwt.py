@@ -1,13 +1,38 @@
-from pydantic import Field
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
 from pydantic_settings import SettingsConfigDict
 
-from auth_service.core.configurations import BaseConfig
+from auth_service.core.configurations.base import BaseConfig
+
+
+class SigningKeyConfig(BaseModel):
+    kid: str
+    algorithm: str = Field(default="RS256")
+    # Verification-only keys (e.g. retired ones) have no private key
+    private_key_path: Optional[str] = Field(default=None)
+    public_key_path: Optional[str] = Field(default=None)
+    # Signing starts at `not_before`, verification stops at `not_after`
+    not_before: Optional[datetime] = Field(default=None)
+    not_after: Optional[datetime] = Field(default=None)
 
 
 class JWTConfig(BaseConfig):
-    secret_key: str
+    # Used for HMAC algorithms, optional when asymmetric keys are configured
+    secret_key: Optional[str] = Field(default=None)
     algorithm: str = Field(default="HS256")
+    signing_keys: List[SigningKeyConfig] = Field(default_factory=list)
     access_token_expires_in: int = Field(default=3600)  # 1 hour
     refresh_token_expires_in: int = Field(default=604800)  # 7 days
 
+    token_cache_enabled: bool = Field(default=False)
+    token_cache_max_size: int = Field(default=10000)
+    token_cache_ttl: int = Field(default=60)  # 1 minute
+
+    # Verify access tokens by signature and a synced revocation denylist,
+    # falling back to the session lookup when the denylist is stale
+    stateless_access_tokens: bool = Field(default=False)
+    revocation_max_staleness: float = Field(default=10.0)  # seconds
+
     model_config = SettingsConfigDict(env_prefix="JWT_")
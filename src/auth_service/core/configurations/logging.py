@@ -0,0 +1,22 @@
+from typing import Dict, Literal
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from auth_service.core.configurations.base import BaseConfig
+
+
+class LoggingConfig(BaseConfig):
+    level: str = Field(default="DEBUG")
+    directory: str = Field(default="logs")
+    backup_count: int = Field(default=7)
+    console: bool = Field(default=False)
+    # Format and write records in a background thread
+    queue: bool = Field(default=False)
+    format: Literal["text", "json"] = Field(default="text")
+    # Logger name -> share of DEBUG records kept, e.g. {"sqlalchemy": 0.01}
+    sampling: Dict[str, float] = Field(default_factory=dict)
+    # Logger name -> DEBUG records per second
+    rate_limits: Dict[str, float] = Field(default_factory=dict)
+
+    model_config = SettingsConfigDict(env_prefix="LOG_")
@@ -0,0 +1,22 @@
+from typing import Literal, Optional
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from auth_service.core.configurations.base import BaseConfig
+
+
+class PasswordConfig(BaseConfig):
+    rounds: int = Field(default=12)  # bcrypt cost factor
+    # Hash time calibrate() aims for, seconds; unset keeps `rounds`
+    target_latency: Optional[float] = Field(default=None)
+    # Bounds of the calibrated cost, `min_rounds` is the security floor
+    min_rounds: int = Field(default=10)
+    max_rounds: int = Field(default=16)
+    calibration_rounds: int = Field(default=8)  # cheap cost calibrate() times
+    calibration_samples: int = Field(default=3)
+    executor: Literal["thread", "process"] = Field(default="thread")
+    workers: Optional[int] = Field(default=None)  # defaults to CPU count
+    max_queue_size: int = Field(default=64)
+
+    model_config = SettingsConfigDict(env_prefix="PASSWORD_")
@@ -1,17 +1,46 @@
+from typing import Optional
+
 from pydantic import Field, computed_field
 from pydantic_settings import SettingsConfigDict
 
-from auth_service.core.configurations import BaseConfig
+from auth_service.core.configurations.base import BaseConfig
 
 
 class RedisConfig(BaseConfig):
     host: str = Field(default="localhost")
     port: int = Field(default=6379)
     db: int = Field(default=0)
+    # Takes precedence over host and port when set
+    unix_socket_path: Optional[str] = Field(default=None)
+    username: Optional[str] = Field(default=None)
+    password: Optional[str] = Field(default=None)
+
+    max_connections: int = Field(default=50)
+    socket_timeout: Optional[float] = Field(default=5.0)  # seconds
+    socket_connect_timeout: Optional[float] = Field(default=2.0)  # seconds
+    socket_keepalive: bool = Field(default=True)
+    health_check_interval: int = Field(default=30)  # seconds, 0 disables
+    retry_on_timeout: bool = Field(default=False)
+
+    # Server-assisted caching of session reads, see SessionClientCache
+    client_cache_enabled: bool = Field(default=False)
+    client_cache_max_size: int = Field(default=10000)
+    client_cache_ttl: float = Field(default=60)  # upper bound, seconds
+
+    # Sessions kept per user, the soonest expiring are evicted; 0 disables
+    max_sessions_per_user: int = Field(default=0)
+
+    sweep_scan_count: int = Field(default=500)
+    sweep_interval: float = Field(default=1.0)  # seconds between passes
+    sweep_time_budget: float = Field(default=0.05)  # seconds per pass
+    # Seconds the worker elected to sweep holds its lock between passes
+    sweep_lock_ttl: float = Field(default=10.0)
 
     @computed_field
     @property
     def dsn(self) -> str:
+        if self.unix_socket_path:
+            return f"unix://{self.unix_socket_path}?db={self.db}"
         return f"redis://{self.host}:{self.port}/{self.db}"
 
     model_config = SettingsConfigDict(env_prefix="REDIS_")
@@ -0,0 +1,18 @@
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from auth_service.core.configurations.base import BaseConfig
+
+
+class UserCacheConfig(BaseConfig):
+    enabled: bool = Field(default=False)
+    # Per-process tier, other workers see changes once entries expire
+    max_size: int = Field(default=10000)
+    ttl: float = Field(default=30)  # seconds
+    # Shared tier, invalidated on every write
+    redis_enabled: bool = Field(default=False)
+    redis_ttl: int = Field(default=300)  # seconds
+    # Unknown users are remembered briefly to shield the database
+    negative_ttl: float = Field(default=5)  # seconds
+
+    model_config = SettingsConfigDict(env_prefix="USER_CACHE_")
@@ -0,0 +1,19 @@
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from auth_service.core.configurations.base import BaseConfig
+
+
+class UsernameFilterConfig(BaseConfig):
+    enabled: bool = Field(default=False)
+    # "redis" shares one bitmap between all workers, "local" keeps one per
+    # process and is only allowed with a single worker
+    backend: Literal["local", "redis"] = Field(default="local")
+    capacity: int = Field(default=1_000_000)  # expected number of users
+    false_positive_rate: float = Field(default=0.01)
+    # How often a local filter checks whether it was marked stale, seconds
+    refresh_interval: float = Field(default=30)
+
+    model_config = SettingsConfigDict(env_prefix="USERNAME_FILTER_")
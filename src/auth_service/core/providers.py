@@ -0,0 +1,292 @@
+from functools import partial
+from typing import AsyncIterator, Iterator, List, Optional
+
+from aioredis import Redis
+from dishka import Provider, Scope, from_context, provide
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth_service.core.configurations import Config
+from auth_service.domain.repositories import (
+    AbstractSessionRepository,
+    AbstractUserRepository,
+)
+from auth_service.infrastructure.cache.bloom_filter import (
+    BloomFilter,
+    LocalBloomFilter,
+    RedisBloomFilter,
+)
+from auth_service.infrastructure.cache.user_cache import (
+    CachingUserRepository,
+    UserCache,
+)
+from auth_service.infrastructure.cache.username_filter import FilteredUserRepository
+from auth_service.infrastructure.metrics.instrumentation import (
+    instrument_cache,
+    instrument_password_service,
+)
+from auth_service.infrastructure.metrics.multiprocess import MultiprocessCollector
+from auth_service.infrastructure.postgresql.database.async_database import (
+    AsyncDatabase,
+    after_commit,
+)
+from auth_service.infrastructure.postgresql.repositories.user_repository import (
+    SQLAlchemyUserRepository,
+)
+from auth_service.infrastructure.redis.admission import AdmissionController
+from auth_service.infrastructure.redis.client import create_redis
+from auth_service.infrastructure.redis.client_cache import SessionClientCache
+from auth_service.infrastructure.redis.revocation_stream import (
+    REVOCATION_STREAM_RETENTION,
+    RevocationListener,
+    RevocationSubscriber,
+)
+from auth_service.infrastructure.redis.session_repository import (
+    RedisSessionRepository,
+)
+from auth_service.infrastructure.redis.session_sweeper import ExpiredSessionSweeper
+from auth_service.infrastructure.security.jwt_service import JWTService
+from auth_service.infrastructure.security.key_ring import KeyRing
+from auth_service.infrastructure.security.password_service import PasswordService
+from auth_service.infrastructure.security.revocation_denylist import (
+    RevocationDenylist,
+)
+from auth_service.infrastructure.security.token_cache import TokenCache
+from auth_service.infrastructure.workers import claim_worker_slot
+
+
+class InfrastructureProvider(Provider):
+    # Everything in APP scope belongs to one worker process and is created
+    # on first use inside it, so no sockets are shared across a fork
+    config = from_context(provides=Config, scope=Scope.APP)
+
+    @provide(scope=Scope.APP)
+    async def get_database(self, config: Config) -> AsyncIterator[AsyncDatabase]:
+        database = AsyncDatabase(config.database)
+        yield database
+        await database.dispose()
+
+    @provide(scope=Scope.APP)
+    async def get_redis(self, config: Config) -> AsyncIterator[Redis]:
+        redis: Redis = create_redis(config.redis)
+        yield redis
+        await redis.close()
+        await redis.connection_pool.disconnect()
+
+    @provide(scope=Scope.APP)
+    async def get_metrics_collector(
+        self, config: Config
+    ) -> AsyncIterator[Optional[MultiprocessCollector]]:
+        if config.app.runtime_directory is None:
+            yield None
+            return
+        collector = MultiprocessCollector(
+            config.app.runtime_directory,
+            claim_worker_slot(config.app.runtime_directory),
+            config.app.metrics_interval,
+        )
+        collector.start()
+        yield collector
+        await collector.stop()
+
+    @provide(scope=Scope.REQUEST)
+    async def get_session(
+        self, database: AsyncDatabase
+    ) -> AsyncIterator[AsyncSession]:
+        async with database.session() as session:
+            yield session
+
+
+class SessionProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    async def get_client_cache(
+        self, redis: Redis, config: Config
+    ) -> AsyncIterator[Optional[SessionClientCache]]:
+        if not config.redis.client_cache_enabled:
+            yield None
+            return
+
+        client_cache = SessionClientCache(
+            redis,
+            max_size=config.redis.client_cache_max_size,
+            ttl=config.redis.client_cache_ttl,
+        )
+        instrument_cache("session_client", client_cache)
+        client_cache.start()
+        yield client_cache
+        await client_cache.stop()
+
+    @provide
+    def get_session_repository(
+        self,
+        redis: Redis,
+        config: Config,
+        client_cache: Optional[SessionClientCache],
+    ) -> RedisSessionRepository:
+        return RedisSessionRepository(
+            redis,
+            revocation_retention=_get_revocation_retention(config),
+            client_cache=client_cache,
+            max_sessions=config.redis.max_sessions_per_user,
+        )
+
+    @provide
+    def get_abstract_session_repository(
+        self, repository: RedisSessionRepository
+    ) -> AbstractSessionRepository:
+        return repository
+
+    @provide
+    async def get_sweeper(
+        self, repository: RedisSessionRepository, redis: Redis, config: Config
+    ) -> AsyncIterator[ExpiredSessionSweeper]:
+        # Workers share the keyspace, a lock picks the one that sweeps it
+        sweeper = ExpiredSessionSweeper(repository, config.redis, redis)
+        sweeper.start()
+        yield sweeper
+        await sweeper.stop()
+
+    @provide
+    def get_token_cache(self, config: Config) -> Optional[TokenCache]:
+        if not config.jwt.token_cache_enabled:
+            return None
+        token_cache = TokenCache(
+            config.jwt.token_cache_max_size, config.jwt.token_cache_ttl
+        )
+        instrument_cache("token", token_cache)
+        return token_cache
+
+    @provide
+    def get_revocation_denylist(self, config: Config) -> Optional[RevocationDenylist]:
+        if not config.jwt.stateless_access_tokens:
+            return None
+        return RevocationDenylist(
+            max_staleness=config.jwt.revocation_max_staleness,
+            access_token_expires_in=config.jwt.access_token_expires_in,
+        )
+
+    @provide
+    async def get_revocation_listener(
+        self,
+        redis: Redis,
+        config: Config,
+        token_cache: Optional[TokenCache],
+        denylist: Optional[RevocationDenylist],
+    ) -> AsyncIterator[RevocationListener]:
+        subscribers: List[RevocationSubscriber] = [
+            subscriber
+            for subscriber in (token_cache, denylist)
+            if subscriber is not None
+        ]
+
+        listener = RevocationListener(
+            redis, subscribers, retention=_get_revocation_retention(config)
+        )
+        listener.start()
+        yield listener
+        await listener.stop()
+
+
+class SecurityProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_key_ring(self, config: Config) -> KeyRing:
+        return KeyRing(config.jwt)
+
+    @provide
+    def get_jwt_service(
+        self,
+        config: Config,
+        repository: AbstractSessionRepository,
+        token_cache: Optional[TokenCache],
+        key_ring: KeyRing,
+        denylist: Optional[RevocationDenylist],
+        # Resolved so that revocations reach the caches from the start
+        listener: RevocationListener,
+    ) -> JWTService:
+        return JWTService(config.jwt, repository, token_cache, key_ring, denylist)
+
+    @provide
+    def get_password_service(self, config: Config) -> Iterator[PasswordService]:
+        password_service = PasswordService(config.password)
+        instrument_password_service(password_service)
+        yield password_service
+        password_service.shutdown()
+
+    @provide
+    def get_admission_controller(
+        self, redis: Redis, config: Config
+    ) -> Optional[AdmissionController]:
+        if not config.admission.enabled:
+            return None
+        return AdmissionController(redis, config.admission)
+
+
+class UserProvider(Provider):
+    @provide(scope=Scope.APP)
+    def get_user_cache(self, redis: Redis, config: Config) -> Optional[UserCache]:
+        if not config.user_cache.enabled:
+            return None
+        user_cache = UserCache(config.user_cache, redis)
+        instrument_cache("user", user_cache)
+        return user_cache
+
+    @provide(scope=Scope.APP)
+    def get_username_filter(
+        self, redis: Redis, config: Config
+    ) -> Optional[BloomFilter]:
+        filter_config = config.username_filter
+        if not filter_config.enabled:
+            return None
+        if filter_config.backend == "redis":
+            return RedisBloomFilter(
+                redis, filter_config.capacity, filter_config.false_positive_rate
+            )
+        return LocalBloomFilter(
+            filter_config.capacity, filter_config.false_positive_rate
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_sqlalchemy_user_repository(
+        self, session: AsyncSession
+    ) -> SQLAlchemyUserRepository:
+        return SQLAlchemyUserRepository(session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_user_repository(
+        self,
+        repository: SQLAlchemyUserRepository,
+        session: AsyncSession,
+        user_cache: Optional[UserCache],
+        username_filter: Optional[BloomFilter],
+    ) -> AbstractUserRepository:
+        # The filter answers before the cache, the cache before the database
+        user_repository: AbstractUserRepository = repository
+        if user_cache is not None:
+            user_repository = CachingUserRepository(
+                user_repository, user_cache, partial(after_commit, session)
+            )
+        if username_filter is not None:
+            user_repository = FilteredUserRepository(user_repository, username_filter)
+        return user_repository
+
+
+def _get_revocation_retention(config: Config) -> int:
+    # Replaying the stream must restore every revocation that still affects
+    # a live access token or a cached verification
+    return max(
+        REVOCATION_STREAM_RETENTION,
+        config.jwt.access_token_expires_in,
+        config.jwt.token_cache_ttl,
+    )
+
+
+def get_providers() -> List[Provider]:
+    return [
+        InfrastructureProvider(),
+        SessionProvider(),
+        SecurityProvider(),
+        UserProvider(),
+    ]
@@ -14,3 +14,10 @@ class User:
 
     def verify_password(self, plain_password: str, bcrypt) -> bool:
         return bcrypt.checkpw(plain_password.encode(), self.hashed_password.encode())
+
+    async def verify_password_async(
+        self, plain_password: str, password_service
+    ) -> bool:
+        return await password_service.verify_password_async(
+            plain_password, self.hashed_password
+        )
@@ -1,6 +1,8 @@
 from auth_service.domain.exceptions.auth import (
     AuthenticationError,
+    AuthenticationOverloadedError,
     InvalidCredentialsError,
+    TooManyAttemptsError,
     UserAlreadyExistsError,
     UserNotFoundError,
 )
@@ -8,18 +10,22 @@ from auth_service.domain.exceptions.token import (
     TokenError,
     TokenExpiredError,
     TokenInvalidError,
+    TokenReuseError,
     TokenRevokedError,
     TokenTypeError,
 )
 
 __all__ = [
     "AuthenticationError",
+    "AuthenticationOverloadedError",
     "InvalidCredentialsError",
     "TokenError",
     "TokenExpiredError",
     "TokenInvalidError",
+    "TokenReuseError",
     "TokenRevokedError",
     "TokenTypeError",
+    "TooManyAttemptsError",
     "UserAlreadyExistsError",
     "UserNotFoundError",
 ]
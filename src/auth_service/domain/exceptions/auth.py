@@ -18,3 +18,16 @@ class UserNotFoundError(AuthenticationError):
 class InvalidCredentialsError(AuthenticationError):
     def __init__(self) -> None:
         super().__init__("Invalid credentials.")
+
+
+class AuthenticationOverloadedError(AuthenticationError):
+    def __init__(self) -> None:
+        super().__init__("Authentication is temporarily overloaded.")
+
+
+class TooManyAttemptsError(AuthenticationError):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(
+            f"Too many authentication attempts, retry in {retry_after:.0f} seconds."
+        )
+        self.retry_after: float = retry_after
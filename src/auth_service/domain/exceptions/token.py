@@ -16,8 +16,13 @@ class TokenExpiredError(TokenError):
 
 
 class TokenRevokedError(TokenError):
+    def __init__(self, message: str = "Token revoked") -> None:
+        super().__init__(message)
+
+
+class TokenReuseError(TokenRevokedError):
     def __init__(self) -> None:
-        super().__init__("Token revoked")
+        super().__init__("Token reuse detected, session family revoked.")
 
 
 class TokenTypeError(TokenError):
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 from auth_service.domain.value_objects.jti import JTI
 from auth_service.domain.value_objects.session import Session
@@ -11,6 +11,10 @@ class AbstractSessionRepository(ABC):
     async def add(self, session: Session) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def add_many(self, sessions: Sequence[Session]) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_session(self, jti: JTI) -> Optional[Session]:
         raise NotImplementedError
@@ -19,6 +23,16 @@ class AbstractSessionRepository(ABC):
     async def get_sessions_by_user_id(self, user_id: UserId) -> List[Session]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_sessions_page(
+        self, user_id: UserId, cursor: int = 0, count: int = 100
+    ) -> Tuple[int, List[Session]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def rotate(self, old_jti: JTI, session: Session) -> Session:
+        raise NotImplementedError
+
     @abstractmethod
     async def revoke_session(self, jti: JTI) -> None:
         raise NotImplementedError
@@ -30,3 +44,13 @@ class AbstractSessionRepository(ABC):
     @abstractmethod
     async def is_active(self, jti: JTI) -> bool:
         raise NotImplementedError
+
+    @abstractmethod
+    async def are_active(self, jtis: Sequence[JTI]) -> List[bool]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def cleanup_expired_sessions(
+        self, cursor: int = 0, count: int = 500
+    ) -> Tuple[int, int]:
+        raise NotImplementedError
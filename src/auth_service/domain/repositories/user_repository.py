@@ -10,6 +10,10 @@ class AbstractUserRepository(ABC):
     async def add(self, user: User) -> User:
         raise NotImplementedError
     
+    @abstractmethod
+    async def update(self, user: User) -> User:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_id(self, user_id: UserId) -> Optional[User]:
         raise NotImplementedError
@@ -2,10 +2,12 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict
 
-from auth_service.domain.value_objects import JTI, TokenType, UserId
+from auth_service.domain.value_objects.jti import JTI
+from auth_service.domain.value_objects.token_type import TokenType
+from auth_service.domain.value_objects.user_id import UserId
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class JWTPayload:
     sub: UserId
     jti: JTI
@@ -16,7 +18,7 @@ class JWTPayload:
 
     def to_dict(self) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
-            "sub": self.sub,
+            "sub": str(self.sub),
             "jti": str(self.jti),
             "type": self.type,
             "exp": self.exp.timestamp(),
@@ -2,10 +2,11 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
 
-from auth_service.domain.value_objects import JTI, UserId
+from auth_service.domain.value_objects.jti import JTI
+from auth_service.domain.value_objects.user_id import UserId
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Session:
     jti: JTI
     user_id: UserId
@@ -15,6 +16,8 @@ class Session:
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
     is_revoked: bool = False
+    # JTI of the first session of a refresh token rotation chain
+    family_id: Optional[JTI] = None
 
     def is_active(self) -> bool:
         return not self.is_revoked and datetime.now(timezone.utc) < self.expires_at
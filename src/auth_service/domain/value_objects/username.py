@@ -2,7 +2,7 @@ from dataclasses import dataclass
 import re
 from typing import ClassVar
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Username:
     value: str
 
@@ -1,8 +1,32 @@
-from auth_service.infrastructure import logging, postgresql, redis, security
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from . import cache
+    from . import logging
+    from . import metrics
+    from . import postgresql
+    from . import redis
+    from . import security
+    from . import workers
 
 __all__ = [
+    "cache",
     "logging",
+    "metrics",
     "postgresql",
     "redis",
     "security",
+    "workers",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Submodules are imported on first access, not with the package
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(__all__)
@@ -0,0 +1,30 @@
+# Auto-generated __init__.py
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from . import bloom_filter
+    from . import ttl_cache
+    from . import user_cache
+    from . import user_codec
+    from . import username_filter
+
+__all__ = [
+    "bloom_filter",
+    "ttl_cache",
+    "user_cache",
+    "user_codec",
+    "username_filter",
+]
+
+
+def __getattr__(name: str) -> Any:
+    # Submodules are imported on first access, not with the package
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(__all__)
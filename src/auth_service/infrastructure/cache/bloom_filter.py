@@ -0,0 +1,307 @@
+import hashlib
+import math
+import uuid
+from abc import ABC, abstractmethod
+from typing import AsyncIterable, List, Optional, Sequence
+
+from aioredis import Redis
+from aioredis.client import Script
+
+# Items are written to Redis in batches while rebuilding
+REBUILD_BATCH_SIZE = 1000
+# Held by the process rebuilding a shared filter, extended by every batch
+REBUILD_LOCK_TTL = 60_000  # milliseconds
+
+# KEYS[1] - filter bitmap, KEYS[2] - item counter,
+# KEYS[3] - bitmap being rebuilt, KEYS[4] - its item counter
+# ARGV - bit positions of the item
+# Items added during a rebuild also go to the new bitmap,
+# otherwise they would be lost when it replaces the current one.
+# A missing bitmap is left to the rebuild, creating it here would mark
+# a filter holding just this item as built.
+_ADD_SCRIPT = """
+local function add(bitmap, counter)
+    local added = 0
+    for _, position in ipairs(ARGV) do
+        if redis.call('SETBIT', bitmap, position, 1) == 0 then
+            added = 1
+        end
+    end
+    if added == 1 then
+        redis.call('INCR', counter)
+    end
+end
+
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    add(KEYS[1], KEYS[2])
+end
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    add(KEYS[3], KEYS[4])
+end
+return 1
+"""
+
+# KEYS[1] - filter bitmap
+# ARGV - bit positions of the item
+# Until the filter is built every item might be present.
+_CONTAINS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 1
+end
+for _, position in ipairs(ARGV) do
+    if redis.call('GETBIT', KEYS[1], position) == 0 then
+        return 0
+    end
+end
+return 1
+"""
+
+
+# KEYS[1] - rebuild lock, KEYS[2] - bitmap being rebuilt, KEYS[3] - its counter
+# ARGV[1] - lock token, ARGV[2] - lock TTL in milliseconds,
+# ARGV[3] - number of items, ARGV[4..] - their bit positions
+# Nothing is written once the lock has passed to another builder.
+_WRITE_BATCH_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+for i = 4, #ARGV do
+    redis.call('SETBIT', KEYS[2], ARGV[i], 1)
+end
+redis.call('INCRBY', KEYS[3], ARGV[3])
+return 1
+"""
+
+# KEYS[1] - rebuild lock, KEYS[2] - bitmap being rebuilt, KEYS[3] - its counter,
+# KEYS[4] - filter bitmap, KEYS[5] - item counter
+# ARGV[1] - lock token
+_FINISH_REBUILD_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('RENAME', KEYS[2], KEYS[4])
+redis.call('RENAME', KEYS[3], KEYS[5])
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+
+class BloomFilter(ABC):
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        if capacity <= 0:
+            raise ValueError("Bloom filter capacity must be positive")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("Bloom filter false positive rate must be in (0, 1)")
+
+        self.size: int = math.ceil(
+            -capacity * math.log(false_positive_rate) / math.log(2) ** 2
+        )
+        self.hash_count: int = max(1, round(self.size / capacity * math.log(2)))
+
+        # Outcomes reported by callers that checked positives at the source
+        self.false_positives: int = 0
+        self.true_negatives: int = 0
+
+    @abstractmethod
+    async def add(self, item: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def might_contain(self, item: str) -> bool:
+        raise NotImplementedError
+
+    async def add_many(self, items: Sequence[str]) -> None:
+        for item in items:
+            await self.add(item)
+
+    @abstractmethod
+    async def rebuild(self, items: AsyncIterable[str]) -> bool:
+        # False if another process is already rebuilding the filter
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count(self) -> int:
+        raise NotImplementedError
+
+    async def estimated_false_positive_rate(self) -> float:
+        items: int = await self.count()
+        return (1 - math.exp(-self.hash_count * items / self.size)) ** self.hash_count
+
+    @property
+    def observed_false_positive_rate(self) -> float:
+        absent: int = self.false_positives + self.true_negatives
+        return self.false_positives / absent if absent else 0.0
+
+    def _positions(self, item: str) -> List[int]:
+        # Double hashing: k positions from two halves of one digest
+        digest: bytes = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first: int = int.from_bytes(digest[:8], "big")
+        second: int = int.from_bytes(digest[8:], "big") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+
+class LocalBloomFilter(BloomFilter):
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        super().__init__(capacity, false_positive_rate)
+        self._bits: bytearray = bytearray((self.size + 7) // 8)
+        self._count: int = 0
+        self._ready: bool = False
+        # Items added while a rebuild is running
+        self._pending: Optional[List[str]] = None
+
+    async def add(self, item: str) -> None:
+        if self._add(self._bits, item):
+            self._count += 1
+        if self._pending is not None:
+            self._pending.append(item)
+
+    async def might_contain(self, item: str) -> bool:
+        if not self._ready:
+            return True
+        bits: bytearray = self._bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    async def rebuild(self, items: AsyncIterable[str]) -> bool:
+        bits: bytearray = bytearray(len(self._bits))
+        count: int = 0
+        self._pending = []
+        try:
+            async for item in items:
+                count += self._add(bits, item)
+            # No awaits from here on, so nothing can be added in between
+            for item in self._pending:
+                count += self._add(bits, item)
+        finally:
+            self._pending = None
+
+        self._bits = bits
+        self._count = count
+        self._ready = True
+        return True
+
+    async def count(self) -> int:
+        return self._count
+
+    def _add(self, bits: bytearray, item: str) -> bool:
+        added: bool = False
+        for position in self._positions(item):
+            mask: int = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        return added
+
+
+class RedisBloomFilter(BloomFilter):
+    def __init__(
+        self,
+        redis: Redis,
+        capacity: int,
+        false_positive_rate: float,
+        key: str = "username_filter",
+    ) -> None:
+        super().__init__(capacity, false_positive_rate)
+        self._redis: Redis = redis
+        self._key: str = key
+        self._count_key: str = f"{key}:count"
+        self._rebuild_key: str = f"{key}:rebuild"
+        self._rebuild_count_key: str = f"{key}:rebuild:count"
+        self._rebuild_lock_key: str = f"{key}:rebuild:lock"
+        self._add_script: Script = redis.register_script(_ADD_SCRIPT)
+        self._contains_script: Script = redis.register_script(_CONTAINS_SCRIPT)
+        self._write_batch_script: Script = redis.register_script(
+            _WRITE_BATCH_SCRIPT
+        )
+        self._finish_rebuild_script: Script = redis.register_script(
+            _FINISH_REBUILD_SCRIPT
+        )
+
+    async def add(self, item: str) -> None:
+        await self._add_script(keys=self._add_keys(), args=self._positions(item))
+
+    async def add_many(self, items: Sequence[str]) -> None:
+        for start in range(0, len(items), REBUILD_BATCH_SIZE):
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for item in items[start : start + REBUILD_BATCH_SIZE]:
+                    await self._add_script(
+                        keys=self._add_keys(),
+                        args=self._positions(item),
+                        client=pipe,
+                    )
+                await pipe.execute()
+
+    async def might_contain(self, item: str) -> bool:
+        return bool(
+            await self._contains_script(keys=[self._key], args=self._positions(item))
+        )
+
+    async def is_built(self) -> bool:
+        return bool(await self._redis.exists(self._key))
+
+    async def rebuild(self, items: AsyncIterable[str]) -> bool:
+        # Only one process writes the new bitmap, the others keep serving
+        # the current one
+        token: str = uuid.uuid4().hex
+        if not await self._redis.set(
+            self._rebuild_lock_key, token, nx=True, px=REBUILD_LOCK_TTL
+        ):
+            return False
+
+        # The new bitmap is allocated upfront so concurrent adds can reach it
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._rebuild_key)
+            pipe.setbit(self._rebuild_key, self.size - 1, 0)
+            pipe.set(self._rebuild_count_key, 0)
+            await pipe.execute()
+
+        batch: List[str] = []
+        async for item in items:
+            batch.append(item)
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                await self._write_batch(batch, token)
+                batch = []
+        if batch:
+            await self._write_batch(batch, token)
+
+        if not await self._finish_rebuild_script(
+            keys=[
+                self._rebuild_lock_key,
+                self._rebuild_key,
+                self._rebuild_count_key,
+                self._key,
+                self._count_key,
+            ],
+            args=[token],
+        ):
+            raise RuntimeError("Username filter rebuild lock was lost")
+        return True
+
+    async def count(self) -> int:
+        return int(await self._redis.get(self._count_key) or 0)
+
+    def _add_keys(self) -> List[str]:
+        return [
+            self._key,
+            self._count_key,
+            self._rebuild_key,
+            self._rebuild_count_key,
+        ]
+
+    async def _write_batch(self, items: List[str], token: str) -> None:
+        positions: List[int] = [
+            position for item in items for position in self._positions(item)
+        ]
+        # Rows are unique, so every item is a new one
+        if not await self._write_batch_script(
+            keys=[
+                self._rebuild_lock_key,
+                self._rebuild_key,
+                self._rebuild_count_key,
+            ],
+            args=[token, REBUILD_LOCK_TTL, len(items), *positions],
+        ):
+            raise RuntimeError("Username filter rebuild lock was lost")
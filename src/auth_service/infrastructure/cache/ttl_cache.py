@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        on_evict: Optional[Callable[[K, V], None]] = None,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("Cache max size must be positive")
+        if ttl <= 0:
+            raise ValueError("Cache TTL must be positive")
+
+        self._max_size: int = max_size
+        self._ttl: float = ttl
+        self._on_evict: Optional[Callable[[K, V], None]] = on_evict
+        # Value and monotonic deadline, least recently used first
+        self._entries: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: K) -> Optional[V]:
+        entry: Optional[Tuple[V, float]] = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, deadline = entry
+        if deadline <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        # A caller-provided TTL can only shorten the configured one
+        expires_in: float = self._ttl if ttl is None else min(ttl, self._ttl)
+        if expires_in <= 0:
+            self.discard(key)
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.monotonic() + expires_in)
+
+        while len(self._entries) > self._max_size:
+            oldest_key: K = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def discard(self, key: K) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _remove(self, key: K) -> None:
+        value, _ = self._entries.pop(key)
+        if self._on_evict is not None:
+            self._on_evict(key, value)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
@@ -0,0 +1,179 @@
+from functools import partial
+from typing import Awaitable, Callable, Optional, Sequence, Set
+
+from aioredis import Redis
+
+from auth_service.core.configurations import UserCacheConfig
+from auth_service.domain.entities import User
+from auth_service.domain.repositories import AbstractUserRepository
+from auth_service.domain.value_objects import UserId, Username
+from auth_service.infrastructure.cache.ttl_cache import TTLCache
+from auth_service.infrastructure.cache.user_codec import UserCodec
+
+USER_ID_TEMPLATE = "user:id:{user_id}"
+USERNAME_TEMPLATE = "user:username:{username}"
+
+# Cached marker of a user that doesn't exist
+MISSING = b""
+
+# Schedules a coroutine function to run once the transaction has committed
+AfterCommit = Callable[[Callable[[], Awaitable[None]]], None]
+
+
+class UserCache:
+    # Shared by all requests of a process, holds encoded users by cache key
+    def __init__(
+        self,
+        config: Optional[UserCacheConfig] = None,
+        redis: Optional[Redis] = None,
+        codec: Optional[UserCodec] = None,
+    ) -> None:
+        self._config: UserCacheConfig = config or UserCacheConfig()
+        self._local: TTLCache[str, bytes] = TTLCache(
+            self._config.max_size, self._config.ttl
+        )
+        self._redis: Optional[Redis] = redis if self._config.redis_enabled else None
+        self.codec: UserCodec = codec or UserCodec()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        data: Optional[bytes] = self._local.get(key)
+        if data is not None or self._redis is None:
+            return data
+
+        data = await self._redis.get(key)
+        if data is not None:
+            self._local.set(key, data, ttl=self._ttl_for(data))
+        return data
+
+    async def set_user(self, user: User) -> None:
+        data: bytes = self.codec.encode(user)
+        await self._set(
+            [
+                USER_ID_TEMPLATE.format(user_id=user.id.value),
+                USERNAME_TEMPLATE.format(username=user.username.value),
+            ],
+            data,
+        )
+
+    async def set_missing(self, key: str) -> None:
+        await self._set([key], MISSING)
+
+    async def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._local.discard(key)
+        if self._redis is not None:
+            await self._redis.delete(*keys)
+
+    async def _set(self, keys: Sequence[str], data: bytes) -> None:
+        ttl: float = self._ttl_for(data)
+        for key in keys:
+            self._local.set(key, data, ttl=ttl)
+
+        if self._redis is not None:
+            redis_ttl: int = (
+                self._config.redis_ttl
+                if data
+                else max(1, int(self._config.negative_ttl))
+            )
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(key, data, ex=redis_ttl)
+                await pipe.execute()
+
+    def _ttl_for(self, data: bytes) -> float:
+        return self._config.ttl if data else self._config.negative_ttl
+
+    @property
+    def hits(self) -> int:
+        return self._local.hits
+
+    @property
+    def misses(self) -> int:
+        return self._local.misses
+
+    @property
+    def evictions(self) -> int:
+        return self._local.evictions
+
+    @property
+    def hit_ratio(self) -> float:
+        return self._local.hit_ratio
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+class CachingUserRepository(AbstractUserRepository):
+    def __init__(
+        self,
+        repository: AbstractUserRepository,
+        cache: UserCache,
+        after_commit: Optional[AfterCommit] = None,
+    ) -> None:
+        self._repository: AbstractUserRepository = repository
+        self._cache: UserCache = cache
+        self._after_commit: Optional[AfterCommit] = after_commit
+
+    async def add(self, user: User) -> User:
+        added_user: User = await self._repository.add(user)
+        # Drops negative entries left by lookups before registration
+        await self._invalidate(
+            USER_ID_TEMPLATE.format(user_id=user.id.value),
+            USERNAME_TEMPLATE.format(username=user.username.value),
+        )
+        return added_user
+
+    async def update(self, user: User) -> User:
+        # The previous username may be cached too, so read it from the source
+        previous_user: Optional[User] = await self._repository.get_by_id(user.id)
+        updated_user: User = await self._repository.update(user)
+
+        keys: Set[str] = {
+            USER_ID_TEMPLATE.format(user_id=user.id.value),
+            USERNAME_TEMPLATE.format(username=user.username.value),
+        }
+        if previous_user is not None:
+            keys.add(USERNAME_TEMPLATE.format(username=previous_user.username.value))
+        await self._invalidate(*keys)
+        return updated_user
+
+    async def get_by_id(self, user_id: UserId) -> Optional[User]:
+        key: str = USER_ID_TEMPLATE.format(user_id=user_id.value)
+        data: Optional[bytes] = await self._cache.get(key)
+        if data is not None:
+            return self._cache.codec.decode(data) if data else None
+
+        user: Optional[User] = await self._repository.get_by_id(user_id)
+        await self._store(key, user)
+        return user
+
+    async def get_by_username(self, username: Username) -> Optional[User]:
+        key: str = USERNAME_TEMPLATE.format(username=username.value)
+        data: Optional[bytes] = await self._cache.get(key)
+        if data is not None:
+            return self._cache.codec.decode(data) if data else None
+
+        user: Optional[User] = await self._repository.get_by_username(username)
+        await self._store(key, user)
+        return user
+
+    async def exists_by_username(self, username: Username) -> bool:
+        data: Optional[bytes] = await self._cache.get(
+            USERNAME_TEMPLATE.format(username=username.value)
+        )
+        if data is not None:
+            return bool(data)
+        return await self._repository.exists_by_username(username)
+
+    async def _invalidate(self, *keys: str) -> None:
+        await self._cache.invalidate(*keys)
+        if self._after_commit is not None:
+            # Reads until the commit still see the old row and may cache it
+            # again, so the keys are dropped once more afterwards
+            self._after_commit(partial(self._cache.invalidate, *keys))
+
+    async def _store(self, key: str, user: Optional[User]) -> None:
+        if user is None:
+            await self._cache.set_missing(key)
+        else:
+            await self._cache.set_user(user)
@@ -0,0 +1,54 @@
+import struct
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from auth_service.domain.entities import User
+from auth_service.domain.value_objects import UserId, Username
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class UserCodec:
+    # Layout (big-endian):
+    #   version (1 byte) | user ID (16 bytes)
+    #   | created_at, updated_at (8 bytes each, microseconds since epoch)
+    #   | username (1 byte length + ASCII) | hashed password (rest, ASCII)
+    VERSION = 1
+
+    _header: struct.Struct = struct.Struct(">B16sqqB")
+
+    def encode(self, user: User) -> bytes:
+        username: bytes = user.username.value.encode()
+        return (
+            self._header.pack(
+                self.VERSION,
+                user.id.value.bytes,
+                (user.created_at - EPOCH) // MICROSECOND,
+                (user.updated_at - EPOCH) // MICROSECOND,
+                len(username),
+            )
+            + username
+            + user.hashed_password.encode()
+        )
+
+    def decode(self, data: bytes) -> User:
+        try:
+            version, user_id, created_at, updated_at, username_length = (
+                self._header.unpack_from(data)
+            )
+        except struct.error as e:
+            raise ValueError("Malformed cached user") from e
+        if version != self.VERSION:
+            raise ValueError(f"Unsupported cached user version {version}")
+
+        offset: int = self._header.size
+        username: str = data[offset : offset + username_length].decode()
+        offset += username_length
+        return User(
+            id=UserId(UUID(bytes=user_id)),
+            username=Username(username),
+            hashed_password=data[offset:].decode(),
+            created_at=EPOCH + created_at * MICROSECOND,
+            updated_at=EPOCH + updated_at * MICROSECOND,
+        )
@@ -0,0 +1,50 @@
+from typing import Optional
+
+from auth_service.domain.entities import User
+from auth_service.domain.repositories import AbstractUserRepository
+from auth_service.domain.value_objects import UserId, Username
+from auth_service.infrastructure.cache.bloom_filter import BloomFilter
+
+
+# Bumped by writers outside the server, such as the bulk importer, so that
+# workers with a local filter rebuild it
+USERNAME_FILTER_GENERATION = "username_filter:generation"
+
+
+class FilteredUserRepository(AbstractUserRepository):
+    # Answers "username is free" from a Bloom filter of taken usernames,
+    # only possible hits reach the wrapped repository
+    def __init__(
+        self, repository: AbstractUserRepository, username_filter: BloomFilter
+    ) -> None:
+        self._repository: AbstractUserRepository = repository
+        self._filter: BloomFilter = username_filter
+
+    async def add(self, user: User) -> User:
+        added_user: User = await self._repository.add(user)
+        # A rolled back insert leaves a false positive, never a false negative
+        await self._filter.add(user.username.value)
+        return added_user
+
+    async def update(self, user: User) -> User:
+        updated_user: User = await self._repository.update(user)
+        await self._filter.add(user.username.value)
+        return updated_user
+
+    async def get_by_id(self, user_id: UserId) -> Optional[User]:
+        return await self._repository.get_by_id(user_id)
+
+    async def get_by_username(self, username: Username) -> Optional[User]:
+        # Logins always reach the source, a filter missing a fresh user
+        # must never lock them out
+        return await self._repository.get_by_username(username)
+
+    async def exists_by_username(self, username: Username) -> bool:
+        if not await self._filter.might_contain(username.value):
+            self._filter.true_negatives += 1
+            return False
+
+        exists: bool = await self._repository.exists_by_username(username)
+        if not exists:
+            self._filter.false_positives += 1
+        return exists
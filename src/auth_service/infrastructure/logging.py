@@ -1,8 +1,112 @@
+import atexit
+import json
 import logging.config
-from datetime import datetime
-from logging import Logger
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from logging import Logger, LogRecord
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+# Background writer of the queue-based mode, stopped at exit
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    # One compact JSON object per line
+    def format(self, record: LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "at": f"{record.filename}:{record.lineno}",
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class _LoggerRuleFilter(logging.Filter, ABC):
+    # Applies per-logger rules to records at or below `max_level`,
+    # the most specific logger name prefix wins
+    def __init__(self, rules: Dict[str, float], max_level: int) -> None:
+        super().__init__()
+        self._rules: List[Tuple[str, float]] = sorted(
+            rules.items(), key=lambda rule: len(rule[0]), reverse=True
+        )
+        self._max_level: int = max_level
+        self._lock: threading.Lock = threading.Lock()
+        # One instance is shared by every handler, the decision is kept on
+        # the record so all outputs keep or drop the same records
+        self._decision: str = f"_{type(self).__name__.lower()}_{id(self)}"
+
+    def filter(self, record: LogRecord) -> bool:
+        decision: Optional[bool] = record.__dict__.get(self._decision)
+        if decision is None:
+            decision = self._decide(record)
+            setattr(record, self._decision, decision)
+        return decision
+
+    def _decide(self, record: LogRecord) -> bool:
+        if record.levelno > self._max_level:
+            return True
+        for name, value in self._rules:
+            if record.name == name or record.name.startswith(name + "."):
+                with self._lock:
+                    return self._allow(name, value)
+        return True
+
+    @abstractmethod
+    def _allow(self, name: str, value: float) -> bool:
+        raise NotImplementedError
+
+
+class SamplingFilter(_LoggerRuleFilter):
+    # Keeps the given fraction of records of each configured logger
+    def __init__(
+        self, rates: Dict[str, float], max_level: int = logging.DEBUG
+    ) -> None:
+        super().__init__(rates, max_level)
+        self._credits: Dict[str, float] = {}
+
+    def _allow(self, name: str, rate: float) -> bool:
+        # Deterministic: every 1/rate-th record passes
+        credit: float = self._credits.get(name, 1.0) + rate
+        if credit >= 1.0:
+            self._credits[name] = credit - 1.0
+            return True
+        self._credits[name] = credit
+        return False
+
+
+class RateLimitFilter(_LoggerRuleFilter):
+    # Token bucket per configured logger, `limit` records per second
+    def __init__(
+        self, limits: Dict[str, float], max_level: int = logging.DEBUG
+    ) -> None:
+        super().__init__(limits, max_level)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _allow(self, name: str, limit: float) -> bool:
+        now: float = time.monotonic()
+        tokens, updated_at = self._buckets.get(name, (limit, now))
+        tokens = min(limit, tokens + (now - updated_at) * limit)
+        if tokens >= 1.0:
+            self._buckets[name] = (tokens - 1.0, now)
+            return True
+        self._buckets[name] = (tokens, now)
+        return False
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # The listener runs in this process, so records are queued as is and
+    # message formatting happens in the background thread
+    def prepare(self, record: LogRecord) -> LogRecord:
+        return record
 
 
 def setup_logging(
@@ -10,6 +114,11 @@ def setup_logging(
     log_directory: str = "logs",
     backup_count: int = 7,
     log_level: str = "DEBUG",
+    use_queue: bool = False,
+    json_format: bool = False,
+    sampling: Optional[Dict[str, float]] = None,
+    rate_limits: Optional[Dict[str, float]] = None,
+    worker: Optional[int] = None,
 ) -> None:
     # Create logs directory if it doesn't exist
     log_path = Path(log_directory)
@@ -23,12 +132,17 @@ def setup_logging(
     # Generate log file name with current date
     current_date: str = datetime.now().strftime("%Y-%m-%d")
     log_filename: Path = log_path / f"log-{current_date}.log"
+    if worker is not None:
+        # Each worker rotates its own file, a shared one would be renamed
+        # under the others at midnight
+        log_filename = log_path / f"log-{current_date}-worker-{worker}.log"
 
     # Define handlers
     handlers: List[str] = ["file"]
     if output_to_console:
         handlers.append("console")
 
+    formatter: str = "json" if json_format else "detailed"
     logging_config: Dict[str, Any] = {
         "version": 1,
         "disable_existing_loggers": False,
@@ -41,11 +155,14 @@ def setup_logging(
                 ),
                 "datefmt": "%Y-%m-%d %H:%M:%S",
             },
+            "json": {
+                "()": JSONFormatter,
+            },
         },
         "handlers": {
             "console": {
                 "class": "logging.StreamHandler",
-                "formatter": "detailed",
+                "formatter": formatter,
                 "stream": "ext://sys.stdout",
             },
             "file": {
@@ -54,7 +171,7 @@ def setup_logging(
                 "when": "midnight",
                 "interval": 1,
                 "backupCount": backup_count,
-                "formatter": "detailed",
+                "formatter": formatter,
                 "encoding": "utf-8",
             },
         },
@@ -65,7 +182,25 @@ def setup_logging(
     }
 
     try:
+        _stop_listener()
         logging.config.dictConfig(logging_config)
+
+        root: Logger = logging.getLogger()
+        if use_queue:
+            _start_listener(root)
+
+        # Filters run in the calling thread, before anything is queued.
+        # Logger filters skip records propagated from child loggers, so the
+        # same instances go on every handler instead
+        filters: List[logging.Filter] = []
+        if sampling:
+            filters.append(SamplingFilter(sampling))
+        if rate_limits:
+            filters.append(RateLimitFilter(rate_limits))
+        for handler in root.handlers:
+            for log_filter in filters:
+                handler.addFilter(log_filter)
+
         logger: Logger = logging.getLogger(__name__)
         logger.info(f"Logging configured successfully. Handlers: {handlers}")
 
@@ -77,6 +212,31 @@ def setup_logging(
         _setup_fallback_logging(log_level)
 
 
+def _start_listener(root: Logger) -> None:
+    global _listener
+
+    # Formatting and I/O move to the listener thread
+    targets: List[logging.Handler] = list(root.handlers)
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in targets:
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(records))
+
+    _listener = QueueListener(records, *targets, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(_stop_listener)
+    atexit.register(_stop_listener)
+
+
+def _stop_listener() -> None:
+    global _listener
+
+    # Flushes queued records before the handlers are replaced or closed
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def _setup_fallback_logging(log_level: str) -> None:
     logging.basicConfig(
         level=log_level,
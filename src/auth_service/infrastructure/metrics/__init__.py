@@ -0,0 +1,26 @@
+# Auto-generated __init__.py
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from . import instrumentation
+    from . import multiprocess
+    from . import registry
+
+__all__ = [
+    "instrumentation",
+    "multiprocess",
+    "registry",
+]
+
+
+def __getattr__(name: str) -> Any:
+    # Submodules are imported on first access, not with the package
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(__all__)
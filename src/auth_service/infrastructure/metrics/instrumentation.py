@@ -0,0 +1,116 @@
+import time
+from typing import Protocol
+
+from aioredis import ConnectionPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool
+
+from auth_service.infrastructure.metrics.registry import (
+    REGISTRY,
+    CallbackMetric,
+    CounterChild,
+    HistogramChild,
+    MetricsRegistry,
+)
+
+_DB_POOL_CHECKOUTS: CounterChild = REGISTRY.counter(
+    "auth_db_pool_checkouts_total", "Connections checked out of the SQL pool"
+).labels()
+_DB_POOL_WAIT: HistogramChild = REGISTRY.histogram(
+    "auth_db_pool_wait_seconds", "Time spent waiting for a SQL pool connection"
+).labels()
+
+
+class CacheStats(Protocol):
+    @property
+    def hits(self) -> int: ...
+
+    @property
+    def misses(self) -> int: ...
+
+    @property
+    def evictions(self) -> int: ...
+
+    def __len__(self) -> int: ...
+
+
+class PasswordPoolStats(Protocol):
+    @property
+    def queue_depth(self) -> int: ...
+
+    @property
+    def in_flight(self) -> int: ...
+
+    @property
+    def rejected(self) -> int: ...
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self) -> ConnectionPoolEntry:
+        started: float = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _DB_POOL_WAIT.observe(time.perf_counter() - started)
+            _DB_POOL_CHECKOUTS.inc()
+
+
+def instrument_sqlalchemy_pool(pool: Pool, registry: MetricsRegistry = REGISTRY) -> None:
+    connections: CallbackMetric = registry.callback(
+        "auth_db_pool_connections", "SQL pool connections by state", ["state"]
+    )
+    connections.set_function(("checked_out",), pool.checkedout)  # type: ignore
+    connections.set_function(("idle",), pool.checkedin)  # type: ignore
+    # QueuePool reports not yet opened connections as negative overflow
+    connections.set_function(
+        ("overflow",), lambda: max(0, pool.overflow())  # type: ignore
+    )
+    registry.callback("auth_db_pool_size", "Configured SQL pool size").set_function(
+        (), pool.size  # type: ignore
+    )
+
+
+def instrument_redis_pool(
+    pool: ConnectionPool, registry: MetricsRegistry = REGISTRY
+) -> None:
+    connections: CallbackMetric = registry.callback(
+        "auth_redis_pool_connections", "Redis pool connections by state", ["state"]
+    )
+    connections.set_function(("in_use",), lambda: len(pool._in_use_connections))
+    connections.set_function(("idle",), lambda: len(pool._available_connections))
+    registry.callback(
+        "auth_redis_pool_max_connections", "Redis pool connection limit"
+    ).set_function((), lambda: pool.max_connections)
+
+
+def instrument_cache(
+    name: str, cache: CacheStats, registry: MetricsRegistry = REGISTRY
+) -> None:
+    labels = (name,)
+    registry.callback(
+        "auth_cache_hits_total", "Cache lookups served", ["cache"], "counter"
+    ).set_function(labels, lambda: cache.hits)
+    registry.callback(
+        "auth_cache_misses_total", "Cache lookups missed", ["cache"], "counter"
+    ).set_function(labels, lambda: cache.misses)
+    registry.callback(
+        "auth_cache_evictions_total", "Entries evicted by size", ["cache"], "counter"
+    ).set_function(labels, lambda: cache.evictions)
+    registry.callback(
+        "auth_cache_entries", "Entries held", ["cache"]
+    ).set_function(labels, lambda: len(cache))
+
+
+def instrument_password_service(
+    service: PasswordPoolStats, registry: MetricsRegistry = REGISTRY
+) -> None:
+    registry.callback(
+        "auth_password_queue_depth", "Hashing jobs waiting for a worker"
+    ).set_function((), lambda: service.queue_depth)
+    registry.callback(
+        "auth_password_in_flight", "Hashing jobs running or waiting"
+    ).set_function((), lambda: service.in_flight)
+    registry.callback(
+        "auth_password_rejected_total",
+        "Hashing jobs rejected with a full queue",
+        type="counter",
+    ).set_function((), lambda: service.rejected)
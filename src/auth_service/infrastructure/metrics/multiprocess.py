@@ -0,0 +1,84 @@
+import asyncio
+import json
+import logging
+import os
+from logging import Logger
+from pathlib import Path
+from typing import List, Optional
+
+from auth_service.infrastructure.metrics.registry import (
+    REGISTRY,
+    MetricSnapshot,
+    MetricsRegistry,
+    render_snapshots,
+)
+
+SNAPSHOT_PATTERN = "metrics-*.json"
+
+
+def clear_snapshots(directory: str) -> None:
+    # Left by a previous run of the server, its workers are gone
+    for path in Path(directory).glob(SNAPSHOT_PATTERN):
+        path.unlink(missing_ok=True)
+
+
+class MultiprocessCollector:
+    # Every worker has its own registry and the scrape reaches just one of
+    # them. Each one writes a snapshot labelled with its slot to a shared
+    # directory and /metrics merges all of them.
+    def __init__(
+        self,
+        directory: str,
+        worker: int,
+        interval: float = 5.0,
+        registry: MetricsRegistry = REGISTRY,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        self._directory: Path = Path(directory)
+        self._path: Path = self._directory / f"metrics-{worker}.json"
+        self._labels: str = f'worker="{worker}"'
+        self._interval: float = interval
+        self._registry: MetricsRegistry = registry
+        self._logger: Logger = logger or logging.getLogger(__name__)
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def write(self) -> None:
+        # Replaced in one step, readers never see a partial snapshot
+        temporary: Path = self._path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self._registry.snapshot(self._labels)))
+        os.replace(temporary, self._path)
+
+    def render(self) -> str:
+        # This worker's snapshot is fresh, the others are up to `interval` old
+        self.write()
+        snapshots: List[MetricSnapshot] = []
+        for path in sorted(self._directory.glob(SNAPSHOT_PATTERN)):
+            try:
+                snapshots.extend(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # Removed by a worker that is shutting down
+                continue
+        return render_snapshots(snapshots)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._path.unlink(missing_ok=True)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                self._logger.error("Failed to write metrics snapshot: %s", e)
+            await asyncio.sleep(self._interval)
@@ -0,0 +1,326 @@
+import functools
+import time
+from bisect import bisect_left
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+T = TypeVar("T")
+Child = TypeVar("Child")
+
+# Name, help, type and rendered samples of one metric
+MetricSnapshot = Tuple[str, str, str, List[str]]
+
+# Seconds, from 100 microseconds (cache hits) to 10 seconds (bcrypt under load)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self._bounds: Tuple[float, ...] = bounds
+        # Per-bucket counts, the last one is +Inf; made cumulative on render
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricFamily(Generic[Child]):
+    type: str = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Child] = {}
+
+    def labels(self, *labelvalues: str) -> Child:
+        # Resolve once and keep the child, calls on it don't touch this dict
+        child: Optional[Child] = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"Metric {self.name} expects {self.labelnames}")
+            child = self._children[labelvalues] = self._create_child()
+        return child
+
+    def _create_child(self) -> Child:
+        raise NotImplementedError
+
+    def snapshot(self, extra: str = "") -> MetricSnapshot:
+        # `extra` label pairs go on every sample, e.g. 'worker="0"'
+        return (self.name, self.help, self.type, self._render_samples(extra))
+
+    def _render_samples(self, extra: str) -> List[str]:
+        lines: List[str] = []
+        for labelvalues, child in list(self._children.items()):
+            lines.extend(
+                self._render_child(self._format_labels(labelvalues, extra), child)
+            )
+        return lines
+
+    def _render_child(self, labels: str, child: Child) -> List[str]:
+        raise NotImplementedError
+
+    def _format_labels(self, labelvalues: Tuple[str, ...], *extra: str) -> str:
+        pairs: List[str] = [
+            f'{name}="{_escape(value)}"'
+            for name, value in zip(self.labelnames, labelvalues)
+        ]
+        pairs.extend(pair for pair in extra if pair)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(MetricFamily[CounterChild]):
+    type = "counter"
+
+    def _create_child(self) -> CounterChild:
+        return CounterChild()
+
+    def _render_child(self, labels: str, child: CounterChild) -> List[str]:
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class Gauge(MetricFamily[GaugeChild]):
+    type = "gauge"
+
+    def _create_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def _render_child(self, labels: str, child: GaugeChild) -> List[str]:
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class Histogram(MetricFamily[HistogramChild]):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+
+    def _create_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def _render_samples(self, extra: str) -> List[str]:
+        lines: List[str] = []
+        for labelvalues, child in list(self._children.items()):
+            cumulative: int = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                labels: str = self._format_labels(
+                    labelvalues, extra, f'le="{_format_value(bound)}"'
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = self._format_labels(labelvalues, extra)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class CallbackMetric(MetricFamily[Callable[[], float]]):
+    # Values are read from their source at scrape time, e.g. pool sizes
+    # or cache counters that are already tracked elsewhere
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str], type: str
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.type = type
+
+    def set_function(
+        self, labelvalues: Tuple[str, ...], function: Callable[[], float]
+    ) -> None:
+        # A newer source (e.g. a recreated pool) replaces the previous one
+        self._children[labelvalues] = function
+
+    def _render_child(self, labels: str, child: Callable[[], float]) -> List[str]:
+        return [f"{self.name}{labels} {_format_value(child())}"]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, MetricFamily[Any]] = {}
+
+    def counter(
+        self, name: str, help: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(name, lambda: Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(name, lambda: Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            name, lambda: Histogram(name, help, labelnames, buckets)
+        )
+
+    def callback(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        type: str = "gauge",
+    ) -> CallbackMetric:
+        return self._register(
+            name, lambda: CallbackMetric(name, help, labelnames, type)
+        )
+
+    def render(self) -> str:
+        return render_snapshots(self.snapshot())
+
+    def snapshot(self, extra: str = "") -> List[MetricSnapshot]:
+        return [metric.snapshot(extra) for metric in self._metrics.values()]
+
+    def _register(self, name: str, factory: Callable[[], Any]) -> Any:
+        # Get-or-create, so modules can declare the metrics they share
+        metric: Optional[MetricFamily[Any]] = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = factory()
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+
+def render_snapshots(snapshots: Iterable[MetricSnapshot]) -> str:
+    # Samples of the same metric from several sources share one header
+    merged: Dict[str, MetricSnapshot] = {}
+    for name, help, type, samples in snapshots:
+        if name in merged:
+            merged[name][3].extend(samples)
+        else:
+            merged[name] = (name, help, type, list(samples))
+
+    lines: List[str] = []
+    for name, help, type, samples in merged.values():
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {type}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def observe(
+    histogram: HistogramChild,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            started: float = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+def observe_async(
+    histogram: HistogramChild,
+    errors: Optional[Counter] = None,
+    error_types: Tuple[Type[BaseException], ...] = (Exception,),
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    # Only `error_types` are counted, e.g. to leave out domain errors
+    # raised on purpose by the wrapped call
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            started: float = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if errors is not None and isinstance(e, error_types):
+                    errors.labels(type(e).__name__).inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,140 @@
+import logging
+from contextlib import asynccontextmanager
+from logging import Logger
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Self,
+)
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from auth_service.core.configurations import DatabaseConfig
+from auth_service.infrastructure.metrics.instrumentation import (
+    InstrumentedAsyncQueuePool,
+    instrument_sqlalchemy_pool,
+)
+from auth_service.infrastructure.postgresql.database.models.base import Base
+
+# Session.info key of the callbacks to run once the transaction commits
+AFTER_COMMIT = "after_commit"
+
+
+def after_commit(
+    session: AsyncSession, callback: Callable[[], Awaitable[None]]
+) -> None:
+    # Callbacks are dropped if the transaction rolls back
+    session.info.setdefault(AFTER_COMMIT, []).append(callback)
+
+
+class AsyncDatabase:
+    def __init__(self, config: DatabaseConfig, logger: Optional[Logger] = None) -> None:
+        self._config: DatabaseConfig = config
+        self._logger: Logger = logger or logging.getLogger(__name__)
+        self._engine: Optional[AsyncEngine] = None
+        self._session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self._initialize()
+
+    def _initialize(self) -> None:
+        try:
+            dsn: str = self._config.dsn
+            engine_options: Dict[str, Any] = self._config.engine_options
+            engine_options.setdefault("poolclass", InstrumentedAsyncQueuePool)
+
+            self._engine = create_async_engine(dsn, **engine_options)
+            instrument_sqlalchemy_pool(self._engine.pool)
+            self._session_factory = async_sessionmaker(
+                bind=self._engine,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+
+            self._logger.info("Async database connection initialized.")
+
+        except Exception as e:
+            self._logger.error(f"Failed to initialize async database: {e}")
+            raise
+
+    def get_engine(self) -> AsyncEngine:
+        if self._engine is None:
+            raise RuntimeError("Database engine not initialized")
+        return self._engine
+
+    def get_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            raise RuntimeError("Session factory not initialized")
+        return self._session_factory()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncGenerator[AsyncSession, None]:
+        session: AsyncSession = self.get_session()
+        try:
+            yield session
+            await session.commit()
+            self._logger.debug("Transaction committed successfully")
+        except Exception as e:
+            await session.rollback()
+            self._logger.error("Transaction rolled back: %s", e)
+            raise
+        finally:
+            callbacks: List[Callable[[], Awaitable[None]]] = session.info.pop(
+                AFTER_COMMIT, []
+            )
+            await session.close()
+
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                # The transaction is already committed, report and go on
+                self._logger.error("After-commit callback failed: %s", e)
+
+    async def health_check(self) -> bool:
+        try:
+            async with self.get_engine().connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            self._logger.debug("Database health check passed")
+            return True
+        except Exception as e:
+            self._logger.error(f"Database health check failed: {e}")
+            return False
+
+    async def dispose(self) -> None:
+        if self._engine:
+            await self._engine.dispose()
+            self._logger.info("Database connections disposed")
+
+    async def create_tables(self, base: Any = Base) -> None:
+        try:
+            async with self.get_engine().begin() as conn:
+                await conn.run_sync(base.metadata.create_all)
+            self._logger.info("All tables created successfully")
+        except Exception as e:
+            self._logger.error(f"Failed to create tables: {e}")
+            raise
+
+    async def drop_tables(self, base: Any = Base) -> None:
+        try:
+            async with self.get_engine().begin() as conn:
+                await conn.run_sync(base.metadata.drop_all)
+            self._logger.info("All tables dropped successfully")
+        except Exception as e:
+            self._logger.error(f"Failed to drop tables: {e}")
+            raise
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.dispose()
@@ -8,7 +8,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
 
 from auth_service.core.configurations import DatabaseConfig
-from auth_service.infrastructure.postgresql.database.models import Base
+from auth_service.infrastructure.postgresql.database.models.base import Base
 
 
 class Database:
@@ -57,7 +57,7 @@ class Database:
             self._logger.debug("Transaction committed successfully")
         except Exception as e:
             session.rollback()
-            self._logger.error(f"Transaction rolled back: {e}")
+            self._logger.error("Transaction rolled back: %s", e)
             raise
         finally:
             session.close()
@@ -4,7 +4,7 @@ from datetime import datetime
 from sqlalchemy import UUID, DateTime, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from auth_service.infrastructure.postgresql.database.models import Base
+from auth_service.infrastructure.postgresql.database.models.base import Base
 
 
 class UserDB(Base):
@@ -1,19 +1,35 @@
-from typing import Optional, Tuple
+from typing import AsyncIterator, Optional, Tuple
 
-from sqlalchemy import Result, exists, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Result, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
 from sqlalchemy.sql import Select
 
 from auth_service.domain.entities import User
 from auth_service.domain.repositories import AbstractUserRepository
 from auth_service.domain.value_objects import UserId, Username
-from auth_service.infrastructure.postgresql.database.models import UserDB
+from auth_service.infrastructure.metrics.registry import (
+    REGISTRY,
+    Counter,
+    Histogram,
+    observe_async,
+)
+from auth_service.infrastructure.postgresql.database.models.user import UserDB
+
+_SECONDS: Histogram = REGISTRY.histogram(
+    "auth_db_user_repository_seconds",
+    "SQLAlchemyUserRepository query latency",
+    ["method"],
+)
+_ERRORS: Counter = REGISTRY.counter(
+    "auth_db_errors_total", "SQL errors by exception type", ["type"]
+)
 
 
 class SQLAlchemyUserRepository(AbstractUserRepository):
     def __init__(self, session: AsyncSession) -> None:
         self._session: AsyncSession = session
 
+    @observe_async(_SECONDS.labels("add"), _ERRORS)
     async def add(self, user: User) -> User:
         user_db = UserDB(
             id=user.id.value,
@@ -25,7 +41,21 @@ class SQLAlchemyUserRepository(AbstractUserRepository):
         self._session.add(user_db)
         await self._session.flush()
         return user
-    
+
+    @observe_async(_SECONDS.labels("update"), _ERRORS)
+    async def update(self, user: User) -> User:
+        await self._session.execute(
+            update(UserDB)
+            .where(UserDB.id == user.id.value)
+            .values(
+                username=user.username.value,
+                hashed_password=user.hashed_password,
+                updated_at=user.updated_at,
+            )
+        )
+        return user
+
+    @observe_async(_SECONDS.labels("get_by_id"), _ERRORS)
     async def get_by_id(self, user_id: UserId) -> Optional[User]:
         result: Result[Tuple[UserDB]] = await self._session.execute(
             select(UserDB).where(UserDB.id == user_id.value)
@@ -33,6 +63,7 @@ class SQLAlchemyUserRepository(AbstractUserRepository):
         user_db: Optional[UserDB] = result.scalar()
         return self._to_entity(user_db) if user_db else None
 
+    @observe_async(_SECONDS.labels("get_by_username"), _ERRORS)
     async def get_by_username(self, username: Username) -> Optional[User]:
         result: Result[Tuple[UserDB]] = await self._session.execute(
             select(UserDB).where(UserDB.username == username.value)
@@ -40,6 +71,7 @@ class SQLAlchemyUserRepository(AbstractUserRepository):
         user_db: Optional[UserDB] = result.scalar()
         return self._to_entity(user_db) if user_db else None
 
+    @observe_async(_SECONDS.labels("exists_by_username"), _ERRORS)
     async def exists_by_username(self, username: Username) -> bool:
         stmt: Select[Tuple[bool]] = select(
             exists().where(UserDB.username == username.value)
@@ -47,6 +79,14 @@ class SQLAlchemyUserRepository(AbstractUserRepository):
         result: Result[Tuple[bool]] = await self._session.execute(stmt)
         return result.scalar_one()
 
+    async def stream_usernames(self, batch_size: int = 10000) -> AsyncIterator[str]:
+        # Server-side cursor, rows are fetched `batch_size` at a time
+        usernames: AsyncScalarResult[str] = await self._session.stream_scalars(
+            select(UserDB.username).execution_options(yield_per=batch_size)
+        )
+        async for username in usernames:
+            yield username
+
     def _to_entity(self, user_db: UserDB) -> User:
         return User(
             id=UserId(user_db.id),
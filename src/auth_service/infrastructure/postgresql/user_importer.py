@@ -0,0 +1,300 @@
+import asyncio
+import csv
+import json
+import logging
+import re
+import uuid
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from logging import Logger
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import bcrypt
+from sqlalchemy.dialects.postgresql import insert
+
+from auth_service.domain.value_objects import Username
+from auth_service.infrastructure.postgresql.database.async_database import (
+    AsyncDatabase,
+)
+from auth_service.infrastructure.postgresql.database.models.user import UserDB
+
+# PostgreSQL allows at most 32767 bind parameters per statement
+MAX_BATCH_SIZE = 32767 // 5
+
+_BCRYPT_HASH_PATTERN = re.compile(r"^\$2[abxy]\$\d{2}\$[./A-Za-z0-9]{53}$")
+
+ImportFormat = Literal["csv", "jsonl"]
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRecord:
+    line: int
+    username: str
+    password: Optional[str] = None
+    hashed_password: Optional[str] = None
+    # Set for rows that couldn't be parsed, they are rejected with it
+    error: Optional[str] = None
+
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+
+
+@dataclass
+class _Batch:
+    records: List[ImportRecord] = field(default_factory=list)
+    hashed_passwords: List[str] = field(default_factory=list)
+
+
+def read_records(path: Path, file_format: ImportFormat) -> Iterator[ImportRecord]:
+    # Rows are yielded one by one, the file is never loaded as a whole.
+    # Unparsable rows are yielded too, so they get rejected like invalid ones.
+    with path.open(encoding="utf-8", newline="") as file:
+        if file_format == "csv":
+            reader: csv.DictReader = csv.DictReader(file)
+            while True:
+                try:
+                    row: Dict[str, Any] = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    yield ImportRecord(
+                        line=reader.line_num, username="", error=f"Malformed CSV: {e}"
+                    )
+                    continue
+                yield _to_record(reader.line_num, row)
+        else:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    value: Any = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield ImportRecord(
+                        line=line_number,
+                        username="",
+                        error=f"Malformed JSON: {e.msg}",
+                    )
+                    continue
+                yield _to_record(line_number, value)
+
+
+def _to_record(line_number: int, row: Any) -> ImportRecord:
+    if not isinstance(row, dict):
+        return ImportRecord(
+            line=line_number, username="", error="Row is not an object"
+        )
+
+    values: Dict[str, Optional[str]] = {}
+    for name in ("username", "password", "hashed_password"):
+        value: Any = row.get(name)
+        if value is not None and not isinstance(value, str):
+            return ImportRecord(
+                line=line_number,
+                username=str(row.get("username") or ""),
+                error=f"Field '{name}' must be a string",
+            )
+        values[name] = value or None
+
+    return ImportRecord(
+        line=line_number,
+        username=values["username"] or "",
+        password=values["password"],
+        hashed_password=values["hashed_password"],
+    )
+
+
+def _hash_passwords(passwords: List[str], rounds: int) -> List[str]:
+    # Runs in a worker process, one call per chunk to amortize pickling
+    return [
+        bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+        for password in passwords
+    ]
+
+
+class UserImporter:
+    def __init__(
+        self,
+        database: AsyncDatabase,
+        executor: Executor,
+        workers: int,
+        rounds: int = 12,
+        batch_size: int = 1000,
+        on_reject: Optional[Callable[[ImportRecord, str], None]] = None,
+        on_imported: Optional[Callable[[List[str]], Awaitable[None]]] = None,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"Batch size must be between 1 and {MAX_BATCH_SIZE}")
+
+        self._database: AsyncDatabase = database
+        self._executor: Executor = executor
+        self._workers: int = workers
+        self._rounds: int = rounds
+        self._batch_size: int = batch_size
+        self._on_reject: Optional[Callable[[ImportRecord, str], None]] = on_reject
+        # Receives the usernames of every committed batch
+        self._on_imported: Optional[Callable[[List[str]], Awaitable[None]]] = (
+            on_imported
+        )
+        self._logger: Logger = logger or logging.getLogger(__name__)
+
+    async def run(self, records: Iterable[ImportRecord]) -> ImportReport:
+        report = ImportReport()
+        iterator: Iterator[ImportRecord] = iter(records)
+
+        # Hashing of the next batch overlaps with inserting the current one,
+        # at most two batches are held in memory
+        pending: Optional[asyncio.Task[_Batch]] = self._prepare_next(
+            iterator, report
+        )
+        try:
+            while pending is not None:
+                batch: _Batch = await pending
+                pending = self._prepare_next(iterator, report)
+                await self._insert(batch, report)
+                self._logger.info(
+                    "Imported %d of %d users (%d duplicates, %d invalid)",
+                    report.imported,
+                    report.read,
+                    report.duplicates,
+                    report.invalid,
+                )
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+        return report
+
+    def _prepare_next(
+        self, records: Iterator[ImportRecord], report: ImportReport
+    ) -> Optional[asyncio.Task[_Batch]]:
+        chunk: List[ImportRecord] = list(islice(records, self._batch_size))
+        if not chunk:
+            return None
+        report.read += len(chunk)
+        return asyncio.create_task(self._prepare(self._validate(chunk, report)))
+
+    def _validate(
+        self, chunk: List[ImportRecord], report: ImportReport
+    ) -> List[ImportRecord]:
+        valid: List[ImportRecord] = []
+        seen: Set[str] = set()
+        for record in chunk:
+            reason: Optional[str] = record.error
+            if reason is None:
+                reason = self._check(record)
+
+            if reason is not None:
+                report.invalid += 1
+                self._reject(record, reason)
+            elif record.username in seen:
+                report.duplicates += 1
+                self._reject(record, "Duplicate username")
+            else:
+                seen.add(record.username)
+                valid.append(record)
+        return valid
+
+    def _check(self, record: ImportRecord) -> Optional[str]:
+        try:
+            Username(record.username)
+        except ValueError as e:
+            return str(e)
+        if record.hashed_password is not None:
+            if not _BCRYPT_HASH_PATTERN.match(record.hashed_password):
+                return "Malformed bcrypt hash"
+        elif not record.password:
+            return "Password or bcrypt hash is required"
+        return None
+
+    async def _prepare(self, records: List[ImportRecord]) -> _Batch:
+        plain: List[Tuple[int, str]] = [
+            (index, record.password)
+            for index, record in enumerate(records)
+            if record.hashed_password is None and record.password is not None
+        ]
+        hashed_passwords: List[str] = [
+            record.hashed_password or "" for record in records
+        ]
+
+        # Spread plaintext passwords evenly over the worker processes
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        chunk_size: int = max(1, -(-len(plain) // self._workers))
+        chunks: List[List[Tuple[int, str]]] = [
+            plain[start : start + chunk_size]
+            for start in range(0, len(plain), chunk_size)
+        ]
+        results: List[List[str]] = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._executor,
+                    _hash_passwords,
+                    [password for _, password in chunk],
+                    self._rounds,
+                )
+                for chunk in chunks
+            )
+        )
+        for chunk, hashes in zip(chunks, results):
+            for (index, _), hashed_password in zip(chunk, hashes):
+                hashed_passwords[index] = hashed_password
+
+        return _Batch(records=records, hashed_passwords=hashed_passwords)
+
+    async def _insert(self, batch: _Batch, report: ImportReport) -> None:
+        if not batch.records:
+            return
+
+        now: datetime = datetime.now(timezone.utc)
+        rows: List[Dict[str, Any]] = [
+            {
+                "id": uuid.uuid4(),
+                "username": record.username,
+                "hashed_password": hashed_password,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for record, hashed_password in zip(batch.records, batch.hashed_passwords)
+        ]
+        # Existing usernames are skipped instead of aborting the transaction
+        statement = (
+            insert(UserDB)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[UserDB.username])
+            .returning(UserDB.username)
+        )
+
+        async with self._database.session() as session:
+            inserted: Set[str] = set((await session.scalars(statement)).all())
+
+        report.imported += len(inserted)
+        if inserted and self._on_imported is not None:
+            await self._on_imported(sorted(inserted))
+        for record in batch.records:
+            if record.username not in inserted:
+                report.duplicates += 1
+                self._reject(record, "Username already exists")
+
+    def _reject(self, record: ImportRecord, reason: str) -> None:
+        if self._on_reject is not None:
+            self._on_reject(record, reason)
@@ -1,7 +1,36 @@
 # Auto-generated __init__.py
 
-from . import session_repository
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from . import admission
+    from . import client
+    from . import client_cache
+    from . import revocation_stream
+    from . import scripts
+    from . import session_codec
+    from . import session_repository
+    from . import session_sweeper
 
 __all__ = [
+    "admission",
+    "client",
+    "client_cache",
+    "revocation_stream",
+    "scripts",
+    "session_codec",
     "session_repository",
+    "session_sweeper",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Submodules are imported on first access, not with the package
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(__all__)
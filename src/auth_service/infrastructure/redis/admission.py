@@ -0,0 +1,79 @@
+import secrets
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Union
+
+from aioredis import Redis
+from aioredis.client import Script
+
+from auth_service.core.configurations import AdmissionConfig
+from auth_service.domain.exceptions import (
+    AuthenticationOverloadedError,
+    TooManyAttemptsError,
+)
+from auth_service.infrastructure.redis.scripts import ADMIT_SCRIPT
+
+USERNAME_ATTEMPTS_TEMPLATE = "attempts:username:{username}"
+IP_ATTEMPTS_TEMPLATE = "attempts:ip:{ip_address}"
+PASSWORD_BUDGET_KEY = "password_budget"
+
+
+class AdmissionController:
+    # Rejects login and registration attempts before any bcrypt work.
+    # Limits and the budget are checked and taken in a single round trip.
+    def __init__(self, redis: Redis, config: Optional[AdmissionConfig] = None) -> None:
+        self._redis: Redis = redis
+        self._config: AdmissionConfig = config or AdmissionConfig()
+        self._window_ms: int = self._config.window * 1000
+        self._lease_ttl_ms: int = self._config.lease_ttl * 1000
+        self._admit_script: Script = redis.register_script(ADMIT_SCRIPT)
+
+        self.admitted: int = 0
+        self.limited: int = 0
+        self.overloaded: int = 0
+
+    @asynccontextmanager
+    async def admit(
+        self, username: str, ip_address: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        lease: Optional[str] = await self.acquire(username, ip_address)
+        try:
+            yield
+        finally:
+            if lease is not None:
+                await self.release(lease)
+
+    async def acquire(
+        self, username: str, ip_address: Optional[str] = None
+    ) -> Optional[str]:
+        keys: List[str] = [
+            PASSWORD_BUDGET_KEY,
+            USERNAME_ATTEMPTS_TEMPLATE.format(username=username),
+        ]
+        limits: List[int] = [self._config.username_limit]
+        if ip_address:
+            keys.append(IP_ATTEMPTS_TEMPLATE.format(ip_address=ip_address))
+            limits.append(self._config.ip_limit)
+
+        lease: Optional[str] = (
+            secrets.token_hex(8) if self._config.password_concurrency > 0 else None
+        )
+        args: List[Union[int, str]] = [
+            self._window_ms,
+            self._config.password_concurrency,
+            self._lease_ttl_ms,
+            lease or "",
+            *limits,
+        ]
+        status, retry_after_ms = await self._admit_script(keys=keys, args=args)
+
+        if status == 0:
+            self.limited += 1
+            raise TooManyAttemptsError(retry_after_ms / 1000)
+        if status < 0:
+            self.overloaded += 1
+            raise AuthenticationOverloadedError
+        self.admitted += 1
+        return lease
+
+    async def release(self, lease: str) -> None:
+        await self._redis.zrem(PASSWORD_BUDGET_KEY, lease)
@@ -0,0 +1,46 @@
+from typing import Awaitable, Callable, Tuple, Type, TypeVar
+
+from aioredis import Redis
+from aioredis.exceptions import RedisError
+
+from auth_service.core.configurations import RedisConfig
+from auth_service.infrastructure.metrics.instrumentation import instrument_redis_pool
+from auth_service.infrastructure.metrics.registry import (
+    REGISTRY,
+    Counter,
+    HistogramChild,
+    observe_async,
+)
+
+T = TypeVar("T")
+
+REDIS_ERRORS: Counter = REGISTRY.counter(
+    "auth_redis_errors_total", "Redis errors by exception type", ["type"]
+)
+# Client and connection failures, not the domain errors callers raise
+REDIS_ERROR_TYPES: Tuple[Type[BaseException], ...] = (RedisError, OSError)
+
+
+def observe_redis(
+    histogram: HistogramChild,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    return observe_async(histogram, REDIS_ERRORS, REDIS_ERROR_TYPES)
+
+
+def create_redis(config: RedisConfig) -> Redis:
+    redis = Redis(
+        host=config.host,
+        port=config.port,
+        db=config.db,
+        unix_socket_path=config.unix_socket_path,
+        username=config.username,
+        password=config.password,
+        max_connections=config.max_connections,
+        socket_timeout=config.socket_timeout,
+        socket_connect_timeout=config.socket_connect_timeout,
+        socket_keepalive=config.socket_keepalive,
+        health_check_interval=config.health_check_interval,
+        retry_on_timeout=config.retry_on_timeout,
+    )
+    instrument_redis_pool(redis.connection_pool)
+    return redis
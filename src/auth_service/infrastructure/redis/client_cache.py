@@ -0,0 +1,167 @@
+import asyncio
+import logging
+from logging import Logger
+from typing import Any, Dict, List, Optional
+
+from aioredis import Redis
+from aioredis.connection import Connection
+
+from auth_service.infrastructure.cache.ttl_cache import TTLCache
+from auth_service.infrastructure.redis.client import (
+    REDIS_ERROR_TYPES,
+    REDIS_ERRORS,
+)
+
+INVALIDATION_CHANNEL = b"__redis__:invalidate"
+
+
+class SessionClientCache:
+    # Keeps recently read values in worker memory. Redis tracks every key
+    # under `prefix` (broadcasting mode) and pushes invalidations for them
+    # over a dedicated connection, so revoked or rewritten sessions are
+    # dropped as soon as the change reaches this worker.
+    def __init__(
+        self,
+        redis: Redis,
+        prefix: str = "session:",
+        max_size: int = 10000,
+        ttl: float = 60,
+        poll_interval: float = 1.0,
+        retry_delay: float = 1.0,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        self._redis: Redis = redis
+        self._prefix: str = prefix
+        self._cache: TTLCache[str, bytes] = TTLCache(max_size, ttl)
+        self._poll_interval: float = poll_interval
+        self._retry_delay: float = retry_delay
+        self._logger: Logger = logger or logging.getLogger(__name__)
+
+        # Values are served from memory only while invalidations are flowing
+        self._tracking: bool = False
+        # Reads in flight by key, an invalidation cancels storing their result
+        self._fills: Dict[str, object] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if not self._tracking:
+            return await self._redis.get(key)
+
+        data: Optional[bytes] = self._cache.get(key)
+        if data is not None:
+            return data
+
+        token = object()
+        self._fills[key] = token
+        try:
+            data = await self._redis.get(key)
+        finally:
+            # Unchanged token means no invalidation arrived during the read
+            if self._fills.get(key) is token:
+                del self._fills[key]
+                if data is not None and self._tracking:
+                    self._cache.set(key, data)
+        return data
+
+    async def _run(self) -> None:
+        while True:
+            connection: Connection = self._redis.connection_pool.make_connection()
+            try:
+                await self._subscribe(connection)
+                self._tracking = True
+                self._logger.info("Client-side caching enabled")
+
+                while True:
+                    # Polling keeps the socket timeout from firing when idle
+                    if await connection.can_read(timeout=self._poll_interval):
+                        self._handle(await connection.read_response())
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error("Client-side caching connection failed: %s", e)
+                if isinstance(e, REDIS_ERROR_TYPES):
+                    REDIS_ERRORS.labels(type(e).__name__).inc()
+                await asyncio.sleep(self._retry_delay)
+            finally:
+                # Without tracking any cached value may be stale
+                self._tracking = False
+                self._invalidate_all()
+                await connection.disconnect()
+
+    async def _subscribe(self, connection: Connection) -> None:
+        await connection.send_command("CLIENT", "ID")
+        client_id: int = await connection.read_response()
+
+        # Invalidations are redirected to this very connection
+        await connection.send_command(
+            "CLIENT",
+            "TRACKING",
+            "ON",
+            "REDIRECT",
+            client_id,
+            "BCAST",
+            "PREFIX",
+            self._prefix,
+        )
+        await connection.read_response()
+
+        await connection.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+        await connection.read_response()
+
+    def _handle(self, response: Any) -> None:
+        if (
+            not isinstance(response, list)
+            or len(response) != 3
+            or response[0] != b"message"
+            or response[1] != INVALIDATION_CHANNEL
+        ):
+            return
+
+        keys: Optional[List[bytes]] = response[2]
+        if keys is None:
+            # Sent on FLUSHALL/FLUSHDB
+            self._invalidate_all()
+            return
+
+        for key_bytes in keys:
+            key: str = key_bytes.decode()
+            self._cache.discard(key)
+            self._fills.pop(key, None)
+
+    def _invalidate_all(self) -> None:
+        self._cache.clear()
+        self._fills.clear()
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+    @property
+    def evictions(self) -> int:
+        return self._cache.evictions
+
+    @property
+    def hit_ratio(self) -> float:
+        return self._cache.hit_ratio
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from logging import Logger
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from aioredis import Redis
+
+from auth_service.infrastructure.redis.client import (
+    REDIS_ERROR_TYPES,
+    REDIS_ERRORS,
+)
+
+REVOCATION_STREAM = "session_revocations"
+# Events are kept at least as long as the tokens they revoke may live,
+# so replaying the stream rebuilds the complete set of revocations.
+# This is the lower bound, providers raise it to the token lifetimes.
+REVOCATION_STREAM_RETENTION = 3600  # 1 hour
+
+SESSION_REVOKED = b"session"
+USER_REVOKED = b"user"
+
+
+class RevocationSubscriber(ABC):
+    @abstractmethod
+    def on_session_revoked(self, jti: str, expires_at: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def on_user_revoked(self, user_id: str, revoked_at: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def on_desync(self) -> None:
+        raise NotImplementedError
+
+    def on_synced(self) -> None:
+        # Called whenever the listener has caught up with the stream
+        pass
+
+
+class RevocationListener:
+    def __init__(
+        self,
+        redis: Redis,
+        subscribers: Sequence[RevocationSubscriber],
+        retention: int = REVOCATION_STREAM_RETENTION,
+        block_ms: int = 5000,
+        batch_size: int = 500,
+        retry_delay: float = 1.0,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        self._redis: Redis = redis
+        self._subscribers: List[RevocationSubscriber] = list(subscribers)
+        self._retention: int = retention
+        self._block_ms: int = block_ms
+        self._batch_size: int = batch_size
+        self._retry_delay: float = retry_delay
+        self._logger: Logger = logger or logging.getLogger(__name__)
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        last_id: Optional[bytes] = None
+        # When the stream was last read up to its end. Events are trimmed
+        # only once older than the retention, so nothing unread can be lost
+        # unless the listener has been behind for longer than that.
+        caught_up_at: float = time.monotonic()
+
+        while True:
+            try:
+                started_at: float = time.monotonic()
+                if last_id is None:
+                    # Replay everything that is still retained
+                    last_id = b"0-0"
+                    caught_up_at = started_at
+                elif started_at - caught_up_at > self._retention:
+                    # Events may have been trimmed while we were away
+                    self._logger.warning("Revocation stream gap, replaying")
+                    self._notify_desync()
+                    last_id = b"0-0"
+                    caught_up_at = started_at
+
+                response: List[Tuple[bytes, List[Tuple[bytes, Dict[bytes, bytes]]]]] = (
+                    await self._redis.xread(
+                        {REVOCATION_STREAM: last_id},
+                        count=self._batch_size,
+                        block=self._block_ms,
+                    )
+                )
+                received: int = 0
+                for _, messages in response or []:
+                    for message_id, fields in messages:
+                        last_id = message_id
+                        received += 1
+                        self._dispatch(fields)
+
+                # A short batch means there is nothing left to catch up on
+                if received < self._batch_size:
+                    caught_up_at = started_at
+                    self._notify_synced()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error("Revocation stream read failed: %s", e)
+                if isinstance(e, REDIS_ERROR_TYPES):
+                    REDIS_ERRORS.labels(type(e).__name__).inc()
+                await asyncio.sleep(self._retry_delay)
+
+    def _dispatch(self, fields: Dict[bytes, bytes]) -> None:
+        kind: bytes = fields.get(b"kind", b"")
+        value: str = fields.get(b"id", b"").decode()
+
+        if kind == SESSION_REVOKED:
+            expires_at: float = float(fields.get(b"exp", b"0")) / 1000
+            for subscriber in self._subscribers:
+                subscriber.on_session_revoked(value, expires_at)
+        elif kind == USER_REVOKED:
+            revoked_at: float = float(fields.get(b"at", b"0")) / 1000
+            for subscriber in self._subscribers:
+                subscriber.on_user_revoked(value, revoked_at)
+
+    def _notify_desync(self) -> None:
+        for subscriber in self._subscribers:
+            subscriber.on_desync()
+
+    def _notify_synced(self) -> None:
+        for subscriber in self._subscribers:
+            subscriber.on_synced()
@@ -0,0 +1,418 @@
+# Lua scripts executed server-side via EVALSHA.
+# Each one runs atomically and costs a single round trip.
+
+# Marks the session stored at `key` as revoked, keeping its TTL.
+# Returns 1 if the session existed, 0 otherwise.
+_REVOKE_SESSION_FUNCTION = """
+local function revoke_session(key)
+    local data = redis.call('GET', key)
+    if not data then
+        return 0
+    end
+
+    -- Binary records start with their version (see BinarySessionCodec)
+    local version = string.byte(data, 1)
+    if version == 1 or version == 2 then
+        -- SETRANGE keeps the TTL and touches only the revoked flag byte
+        redis.call('SETRANGE', key, 1, '\\1')
+        return 1
+    end
+
+    local ok, session = false, nil
+    if version == string.byte('{') then
+        -- Legacy JSON record
+        ok, session = pcall(cjson.decode, data)
+    end
+    if ok and type(session) == 'table' then
+        session['is_revoked'] = true
+        redis.call('SET', key, cjson.encode(session), 'KEEPTTL')
+    else
+        -- If data is corrupted, just delete the session
+        redis.call('DEL', key)
+    end
+    return 1
+end
+"""
+
+# Appends a revocation event, trimming events older than `retention`
+# seconds. Returns the current server time in milliseconds.
+_PUBLISH_REVOCATION_FUNCTION = """
+local function server_time_ms()
+    local now = redis.call('TIME')
+    return tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+end
+
+local function publish_revocation(stream, retention, kind, id, field, value)
+    local now = server_time_ms()
+    redis.call(
+        'XADD', stream, 'MINID', '~', now - tonumber(retention) * 1000, '*',
+        'kind', kind, 'id', id, field, value
+    )
+    return now
+end
+
+-- Revocation time plus the remaining TTL of the session key
+local function session_expires_at(key, retention)
+    local ttl = redis.call('PTTL', key)
+    if ttl < 0 then
+        ttl = tonumber(retention) * 1000
+    end
+    return server_time_ms() + ttl
+end
+"""
+
+# KEYS[1] - session key, KEYS[2] - revocation stream
+# ARGV[1] - stream retention in seconds, ARGV[2] - JTI
+REVOKE_SESSION_SCRIPT = (
+    _REVOKE_SESSION_FUNCTION
+    + _PUBLISH_REVOCATION_FUNCTION
+    + """
+local expires_at = session_expires_at(KEYS[1], ARGV[1])
+if revoke_session(KEYS[1]) == 0 then
+    return 0
+end
+
+publish_revocation(KEYS[2], ARGV[1], 'session', ARGV[2], 'exp', expires_at)
+return 1
+"""
+)
+
+# Per-user session indexes are sorted sets of JTIs scored by the session
+# expiry in milliseconds. Requires server_time_ms().
+_SESSION_INDEX_FUNCTION = """
+-- The index lives exactly as long as its longest-lived session
+local function refresh_index_ttl(index)
+    local last = redis.call('ZRANGE', index, -1, -1, 'WITHSCORES')
+    if last[2] then
+        redis.call('PEXPIREAT', index, last[2])
+    end
+end
+
+-- Converts an index written as a plain SET, scoring members by the TTL
+-- of their session key. Returns the number of dropped dead members.
+local function ensure_sorted_index(index, prefix)
+    if redis.call('TYPE', index)['ok'] ~= 'set' then
+        return 0
+    end
+
+    local now = server_time_ms()
+    local members = redis.call('SMEMBERS', index)
+    redis.call('DEL', index)
+
+    local dropped = 0
+    for _, jti in ipairs(members) do
+        local ttl = redis.call('PTTL', prefix .. jti)
+        if ttl > 0 then
+            redis.call('ZADD', index, now + ttl, jti)
+        else
+            dropped = dropped + 1
+        end
+    end
+    refresh_index_ttl(index)
+    return dropped
+end
+"""
+
+# KEYS[1] - user sessions index
+# ARGV[1] - session key prefix
+# Returns the number of dropped dead members.
+MIGRATE_SESSION_INDEX_SCRIPT = (
+    _PUBLISH_REVOCATION_FUNCTION
+    + _SESSION_INDEX_FUNCTION
+    + """
+return ensure_sorted_index(KEYS[1], ARGV[1])
+"""
+)
+
+# Stores a session and indexes it, dropping expired index members. With
+# a session limit the soonest expiring other sessions are deleted and
+# published as revoked until the user is back at the limit.
+# Returns the number of evicted sessions. Requires the revocation and
+# session index functions.
+_ADD_SESSION_FUNCTION = """
+local function add_session(
+    key, index, stream, data, expires_at, jti, limit, prefix, retention
+)
+    ensure_sorted_index(index, prefix)
+    redis.call('SET', key, data, 'PXAT', expires_at)
+    redis.call('ZREMRANGEBYSCORE', index, '-inf', server_time_ms())
+    redis.call('ZADD', index, expires_at, jti)
+
+    local evicted = 0
+    limit = tonumber(limit)
+    if limit > 0 then
+        local excess = redis.call('ZCARD', index) - limit
+        if excess > 0 then
+            -- One extra candidate in case the new session is among them
+            local candidates = redis.call('ZRANGE', index, 0, excess, 'WITHSCORES')
+            for i = 1, #candidates, 2 do
+                local victim = candidates[i]
+                if evicted == excess then
+                    break
+                end
+                if victim ~= jti then
+                    redis.call('ZREM', index, victim)
+                    if redis.call('DEL', prefix .. victim) == 1 then
+                        publish_revocation(
+                            stream, retention, 'session', victim, 'exp', candidates[i + 1]
+                        )
+                    end
+                    evicted = evicted + 1
+                end
+            end
+        end
+    end
+
+    refresh_index_ttl(index)
+    return evicted
+end
+"""
+
+# KEYS[1] - session key, KEYS[2] - user sessions index,
+# KEYS[3] - revocation stream
+# ARGV[1] - encoded session, ARGV[2] - expiry in milliseconds, ARGV[3] - JTI,
+# ARGV[4] - session limit (0 disables), ARGV[5] - session key prefix,
+# ARGV[6] - stream retention in seconds
+# Returns the number of evicted sessions.
+# Evicted session keys are derived from the index, so this script assumes
+# a non-clustered Redis (or all keys sharing one slot).
+ADD_SESSION_SCRIPT = (
+    _PUBLISH_REVOCATION_FUNCTION
+    + _SESSION_INDEX_FUNCTION
+    + _ADD_SESSION_FUNCTION
+    + """
+return add_session(
+    KEYS[1], KEYS[2], KEYS[3], ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5], ARGV[6]
+)
+"""
+)
+
+# Replaces the session of a refresh token with a new one of the same
+# family. Family IDs are the 16 raw UUID bytes of the chain's first JTI,
+# stored at a fixed offset of binary records (see BinarySessionCodec).
+# The rotated JTI is remembered with its family until it would have
+# expired; presenting it again revokes the family's current session.
+# KEYS[1] - old session key, KEYS[2] - new session key,
+# KEYS[3] - user sessions index, KEYS[4] - revocation stream,
+# KEYS[5] - rotation marker of the old JTI
+# ARGV[1..6] - as for ADD_SESSION_SCRIPT, ARGV[7] - old JTI,
+# ARGV[8] - family key prefix
+# Returns {1, family ID} if rotated, {0, ''} if the old session is
+# missing or revoked and {-1, ''} if reuse was detected.
+# Family and evicted session keys are derived, so this script assumes
+# a non-clustered Redis (or all keys sharing one slot).
+ROTATE_SESSION_SCRIPT = (
+    _PUBLISH_REVOCATION_FUNCTION
+    + _SESSION_INDEX_FUNCTION
+    + _ADD_SESSION_FUNCTION
+    + """
+local function to_hex(raw)
+    return (string.gsub(raw, '.', function(c)
+        return string.format('%02x', string.byte(c))
+    end))
+end
+
+local function from_uuid(uuid)
+    return (string.gsub(string.gsub(uuid, '-', ''), '..', function(h)
+        return string.char(tonumber(h, 16))
+    end))
+end
+
+local function to_uuid(raw)
+    local hex = to_hex(raw)
+    return string.sub(hex, 1, 8) .. '-' .. string.sub(hex, 9, 12) .. '-'
+        .. string.sub(hex, 13, 16) .. '-' .. string.sub(hex, 17, 20) .. '-'
+        .. string.sub(hex, 21, 32)
+end
+
+local data = redis.call('GET', KEYS[1])
+if not data then
+    local family = redis.call('GET', KEYS[5])
+    if not family then
+        return {0, ''}
+    end
+
+    -- A rotated token came back, so someone else holds a copy of it
+    local family_key = ARGV[8] .. to_hex(family)
+    local current = redis.call('GET', family_key)
+    if current then
+        local key = ARGV[5] .. current
+        local expires_at = session_expires_at(key, ARGV[6])
+        if redis.call('DEL', key) == 1 then
+            publish_revocation(KEYS[4], ARGV[6], 'session', current, 'exp', expires_at)
+        end
+        ensure_sorted_index(KEYS[3], ARGV[5])
+        redis.call('ZREM', KEYS[3], current)
+        redis.call('DEL', family_key)
+    end
+    return {-1, ''}
+end
+
+local version = string.byte(data, 1)
+local family = nil
+local revoked = false
+if version == 2 then
+    revoked = string.byte(data, 2) == 1
+    family = string.sub(data, 35, 50)
+elseif version == 1 then
+    revoked = string.byte(data, 2) == 1
+else
+    local ok, session = pcall(cjson.decode, data)
+    revoked = not ok or type(session) ~= 'table' or session['is_revoked'] == true
+    if not revoked and type(session['family_id']) == 'string' then
+        family = from_uuid(session['family_id'])
+    end
+end
+if revoked then
+    return {0, ''}
+end
+-- Sessions written before families existed start their own
+family = family or from_uuid(ARGV[7])
+
+local ttl = redis.call('PTTL', KEYS[1])
+local expires_at = session_expires_at(KEYS[1], ARGV[6])
+redis.call('DEL', KEYS[1])
+ensure_sorted_index(KEYS[3], ARGV[5])
+redis.call('ZREM', KEYS[3], ARGV[7])
+redis.call('SET', KEYS[5], family, 'PX', ttl > 0 and ttl or tonumber(ARGV[6]) * 1000)
+publish_revocation(KEYS[4], ARGV[6], 'session', ARGV[7], 'exp', expires_at)
+
+-- The new record inherits the family of the old one
+local new_data = ARGV[1]
+if string.byte(new_data, 1) == 2 then
+    new_data = string.sub(new_data, 1, 34) .. family .. string.sub(new_data, 51)
+else
+    local session = cjson.decode(new_data)
+    session['family_id'] = to_uuid(family)
+    new_data = cjson.encode(session)
+end
+
+add_session(
+    KEYS[2], KEYS[3], KEYS[4], new_data, ARGV[2], ARGV[3], ARGV[4], ARGV[5], ARGV[6]
+)
+redis.call('SET', ARGV[8] .. to_hex(family), ARGV[3], 'PXAT', ARGV[2])
+return {1, family}
+"""
+)
+
+# KEYS[1] - user sessions index, KEYS[2] - revocation stream
+# ARGV[1] - session key prefix, ARGV[2] - stream retention in seconds,
+# ARGV[3] - user ID
+# Session keys are derived from the index, so this script assumes
+# a non-clustered Redis (or all keys sharing one slot).
+REVOKE_ALL_SESSIONS_SCRIPT = (
+    _REVOKE_SESSION_FUNCTION
+    + _PUBLISH_REVOCATION_FUNCTION
+    + _SESSION_INDEX_FUNCTION
+    + """
+ensure_sorted_index(KEYS[1], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', server_time_ms())
+
+local revoked = 0
+for _, jti in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    local key = ARGV[1] .. jti
+    local expires_at = session_expires_at(key, ARGV[2])
+    if revoke_session(key) == 1 then
+        revoked = revoked + 1
+        publish_revocation(KEYS[2], ARGV[2], 'session', jti, 'exp', expires_at)
+    else
+        -- Delete dangling index record
+        redis.call('ZREM', KEYS[1], jti)
+    end
+end
+
+-- Covers sessions missing from the index: tokens issued before `at`
+publish_revocation(KEYS[2], ARGV[2], 'user', ARGV[3], 'at', server_time_ms())
+return revoked
+"""
+)
+
+# Sliding window limits plus a global lease-based concurrency budget.
+# Each limited subject is a hash of the current window index (w), its
+# count (c) and the previous window count (p); the previous count is
+# weighted by how much of it still overlaps the sliding window.
+# KEYS[1] - budget sorted set (lease token -> expiry),
+# KEYS[2..n] - subject counters
+# ARGV[1] - window in milliseconds, ARGV[2] - budget size (0 disables),
+# ARGV[3] - lease TTL in milliseconds, ARGV[4] - lease token,
+# ARGV[5..] - limits of KEYS[2..n]
+# Returns {1, 0} if admitted, {0, retry after ms} if limited
+# and {-1, 0} if the budget is exhausted.
+ADMIT_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local window = tonumber(ARGV[1])
+local current = math.floor(now / window)
+local elapsed = now - current * window
+
+local counts = {}
+local retry_after = 0
+for i = 2, #KEYS do
+    local limit = tonumber(ARGV[i + 3])
+    local state = redis.call('HMGET', KEYS[i], 'w', 'c', 'p')
+    local last = tonumber(state[1])
+    local count = tonumber(state[2]) or 0
+    local previous = tonumber(state[3]) or 0
+    if last ~= current then
+        previous = (last == current - 1) and count or 0
+        count = 0
+    end
+    counts[i] = {count, previous}
+
+    if previous * (window - elapsed) / window + count + 1 > limit then
+        local wait
+        if count + 1 <= limit then
+            -- Wait for the previous window to fade out enough
+            wait = window - elapsed - (limit - 1 - count) * window / previous
+        else
+            -- Wait for the next window, where this count becomes previous
+            wait = 2 * window - elapsed - (limit - 1) * window / count
+        end
+        retry_after = math.max(retry_after, math.ceil(wait))
+    end
+end
+if retry_after > 0 then
+    return {0, retry_after}
+end
+
+local budget = tonumber(ARGV[2])
+if budget > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+    if redis.call('ZCARD', KEYS[1]) >= budget then
+        return {-1, 0}
+    end
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], ARGV[3])
+end
+
+for i = 2, #KEYS do
+    redis.call('HSET', KEYS[i], 'w', current, 'c', counts[i][1] + 1, 'p', counts[i][2])
+    redis.call('PEXPIRE', KEYS[i], 2 * window)
+end
+return {1, 0}
+"""
+
+# Takes a free lock or extends it for its current holder.
+# KEYS[1] - lock, ARGV[1] - holder token, ARGV[2] - TTL in milliseconds
+# Returns 1 while the caller holds the lock, 0 if someone else does.
+HOLD_LOCK_SCRIPT = """
+local holder = redis.call('GET', KEYS[1])
+if holder == false then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+if holder == ARGV[1] then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Frees a lock unless it has already passed to another holder.
+# KEYS[1] - lock, ARGV[1] - holder token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
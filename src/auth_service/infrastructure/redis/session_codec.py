@@ -0,0 +1,157 @@
+import json
+import struct
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from auth_service.domain.value_objects import JTI, Session, UserId
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class SessionCodec(ABC):
+    @abstractmethod
+    def encode(self, session: Session) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, data: bytes, jti: JTI) -> Session:
+        raise NotImplementedError
+
+
+class JSONSessionCodec(SessionCodec):
+    def encode(self, session: Session) -> bytes:
+        data: Dict[str, Any] = {
+            "user_id": str(session.user_id.value),
+            "created_at": session.created_at.isoformat(),
+            "expires_at": session.expires_at.isoformat(),
+            "device_info": session.device_info,
+            "ip_address": session.ip_address,
+            "user_agent": session.user_agent,
+            "is_revoked": session.is_revoked,
+            "family_id": session.family_id.value if session.family_id else None,
+        }
+        return json.dumps(data).encode()
+
+    def decode(self, data: bytes, jti: JTI) -> Session:
+        try:
+            values: Dict[str, Any] = json.loads(data)
+            return Session(
+                jti=jti,
+                user_id=UserId(UUID(values["user_id"])),
+                created_at=datetime.fromisoformat(values["created_at"]),
+                expires_at=datetime.fromisoformat(values["expires_at"]),
+                device_info=values["device_info"],
+                ip_address=values["ip_address"],
+                user_agent=values["user_agent"],
+                is_revoked=values["is_revoked"],
+                family_id=(
+                    JTI(values["family_id"]) if values.get("family_id") else None
+                ),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError("Malformed JSON session") from e
+
+
+class BinarySessionCodec(SessionCodec):
+    # Layout (big-endian):
+    #   version (1 byte) | revoked flag (1 byte) | user ID (16 bytes)
+    #   | created_at, expires_at (8 bytes each, microseconds since epoch)
+    #   | family ID (16 bytes, version 2 only)
+    #   | device_info, ip_address, user_agent (2 byte length + UTF-8 each)
+    # The revoked flag and family ID offsets are relied on by the scripts.
+    VERSION = 2
+    REVOKED_FLAG_OFFSET = 1
+    FAMILY_ID_OFFSET = 34
+
+    _header: struct.Struct = struct.Struct(">BB16sqq16s")
+    _header_v1: struct.Struct = struct.Struct(">BB16sqq")
+    _length: struct.Struct = struct.Struct(">H")
+    _none_length: int = 0xFFFF
+
+    def encode(self, session: Session) -> bytes:
+        parts: List[bytes] = [
+            self._header.pack(
+                self.VERSION,
+                session.is_revoked,
+                session.user_id.value.bytes,
+                (session.created_at - EPOCH) // MICROSECOND,
+                (session.expires_at - EPOCH) // MICROSECOND,
+                UUID(str(session.family_id or session.jti)).bytes,
+            )
+        ]
+        for value in (session.device_info, session.ip_address, session.user_agent):
+            if value is None:
+                parts.append(self._length.pack(self._none_length))
+            else:
+                encoded: bytes = value.encode()
+                if len(encoded) >= self._none_length:
+                    raise ValueError("Session field is too long")
+                parts.append(self._length.pack(len(encoded)))
+                parts.append(encoded)
+        return b"".join(parts)
+
+    def decode(self, data: bytes, jti: JTI) -> Session:
+        try:
+            version: int = data[0]
+            family_id: Optional[JTI] = None
+            if version == self.VERSION:
+                version, is_revoked, user_id, created_at, expires_at, family = (
+                    self._header.unpack_from(data)
+                )
+                family_id = JTI(str(UUID(bytes=family)))
+                offset: int = self._header.size
+            elif version == 1:
+                version, is_revoked, user_id, created_at, expires_at = (
+                    self._header_v1.unpack_from(data)
+                )
+                offset = self._header_v1.size
+            else:
+                raise ValueError(f"Unsupported session version {version}")
+
+            device_info, offset = self._read_string(data, offset)
+            ip_address, offset = self._read_string(data, offset)
+            user_agent, offset = self._read_string(data, offset)
+        except (struct.error, IndexError) as e:
+            raise ValueError("Malformed binary session") from e
+
+        return Session(
+            jti=jti,
+            user_id=UserId(UUID(bytes=user_id)),
+            created_at=EPOCH + created_at * MICROSECOND,
+            expires_at=EPOCH + expires_at * MICROSECOND,
+            device_info=device_info,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            is_revoked=bool(is_revoked),
+            family_id=family_id,
+        )
+
+    def _read_string(self, data: bytes, offset: int) -> Tuple[Optional[str], int]:
+        (length,) = self._length.unpack_from(data, offset)
+        offset += self._length.size
+        if length == self._none_length:
+            return None, offset
+        if offset + length > len(data):
+            raise ValueError("Malformed binary session")
+        return data[offset : offset + length].decode(), offset + length
+
+
+class VersionedSessionCodec(SessionCodec):
+    def __init__(self, writer: Optional[SessionCodec] = None) -> None:
+        self._writer: SessionCodec = writer or BinarySessionCodec()
+        self._json: JSONSessionCodec = JSONSessionCodec()
+        self._binary: BinarySessionCodec = BinarySessionCodec()
+
+    def encode(self, session: Session) -> bytes:
+        return self._writer.encode(session)
+
+    def decode(self, data: bytes, jti: JTI) -> Session:
+        if not data:
+            raise ValueError("Empty session")
+        # Legacy records are JSON objects, binary ones start with their version
+        if data[0] == ord("{"):
+            return self._json.decode(data, jti)
+        return self._binary.decode(data, jti)
@@ -1,155 +1,354 @@
-import json
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+import time
+from dataclasses import replace
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from uuid import UUID
 
 from aioredis import Redis
+from aioredis.client import Script
+from aioredis.exceptions import ResponseError
 
+from auth_service.domain.exceptions import TokenReuseError, TokenRevokedError
 from auth_service.domain.repositories import AbstractSessionRepository
 from auth_service.domain.value_objects import JTI, Session, UserId
+from auth_service.infrastructure.metrics.registry import (
+    REGISTRY,
+    Histogram,
+)
+from auth_service.infrastructure.redis.client import observe_redis
+from auth_service.infrastructure.redis.client_cache import SessionClientCache
+from auth_service.infrastructure.redis.revocation_stream import (
+    REVOCATION_STREAM,
+    REVOCATION_STREAM_RETENTION,
+)
+from auth_service.infrastructure.redis.session_codec import (
+    SessionCodec,
+    VersionedSessionCodec,
+)
+from auth_service.infrastructure.redis.scripts import (
+    ADD_SESSION_SCRIPT,
+    MIGRATE_SESSION_INDEX_SCRIPT,
+    REVOKE_ALL_SESSIONS_SCRIPT,
+    REVOKE_SESSION_SCRIPT,
+    ROTATE_SESSION_SCRIPT,
+)
+
+T = TypeVar("T")
+
+_SECONDS: Histogram = REGISTRY.histogram(
+    "auth_redis_session_repository_seconds",
+    "RedisSessionRepository call latency",
+    ["method"],
+)
 
 SESSION_TEMPLETE = "session:{jti}"
 USER_SESSIONS_TEMPLATE = "user_sessions:{user_id}"
+ROTATED_SESSION_TEMPLATE = "rotated_session:{jti}"
+SESSION_FAMILY_TEMPLATE = "session_family:{family_id}"
 
 
 class RedisSessionRepository(AbstractSessionRepository):
-    def __init__(self, redis: Redis) -> None:
+    def __init__(
+        self,
+        redis: Redis,
+        codec: Optional[SessionCodec] = None,
+        revocation_retention: int = REVOCATION_STREAM_RETENTION,
+        client_cache: Optional[SessionClientCache] = None,
+        max_sessions: int = 0,
+    ) -> None:
         self._redis: Redis = redis
+        self._codec: SessionCodec = codec or VersionedSessionCodec()
+        self._revocation_retention: int = revocation_retention
+        self._client_cache: Optional[SessionClientCache] = client_cache
+        # Sessions kept per user, the soonest expiring ones are evicted
+        self._max_sessions: int = max_sessions
+        # Scripts are sent with EVALSHA and loaded on first NOSCRIPT only
+        self._add_session_script: Script = redis.register_script(ADD_SESSION_SCRIPT)
+        self._rotate_session_script: Script = redis.register_script(
+            ROTATE_SESSION_SCRIPT
+        )
+        self._migrate_index_script: Script = redis.register_script(
+            MIGRATE_SESSION_INDEX_SCRIPT
+        )
+        self._revoke_session_script: Script = redis.register_script(
+            REVOKE_SESSION_SCRIPT
+        )
+        self._revoke_all_sessions_script: Script = redis.register_script(
+            REVOKE_ALL_SESSIONS_SCRIPT
+        )
 
+    @observe_redis(_SECONDS.labels("add"))
     async def add(self, session: Session) -> None:
-        session_key: str = SESSION_TEMPLETE.format(jti=session.jti.value)
-        user_sessions_key: str = USER_SESSIONS_TEMPLATE.format(
-            user_id=session.user_id.value
-        )
+        # Store, index, prune and evict atomically
+        keys, args = self._add_session_arguments(session)
+        await self._add_session_script(keys=keys, args=args)
 
-        data: Dict[str, Any] = self._session_to_dict(session)
-        expires_in: int = self._calculate_ttl(session)
+    @observe_redis(_SECONDS.labels("add_many"))
+    async def add_many(self, sessions: Sequence[Session]) -> None:
+        if not sessions:
+            return
 
-        # Use an atomic update transaction
-        async with self._redis.pipeline(transaction=True) as pipe:
-            pipe.setex(session_key, expires_in, json.dumps(data))
-            pipe.sadd(user_sessions_key, session.jti.value)
-            pipe.expire(user_sessions_key, expires_in)
+        # Every session is still added atomically, all in one round trip
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for session in sessions:
+                keys, args = self._add_session_arguments(session)
+                await self._add_session_script(keys=keys, args=args, client=pipe)
             await pipe.execute()
 
+    @observe_redis(_SECONDS.labels("rotate"))
+    async def rotate(self, old_jti: JTI, session: Session) -> Session:
+        # Swaps the sessions in one call, so concurrent refreshes with the
+        # same token can't both succeed
+        keys, args = self._add_session_arguments(session)
+        status, family_id = await self._rotate_session_script(
+            keys=[
+                SESSION_TEMPLETE.format(jti=old_jti.value),
+                *keys,
+                ROTATED_SESSION_TEMPLATE.format(jti=old_jti.value),
+            ],
+            args=[
+                *args,
+                old_jti.value,
+                SESSION_FAMILY_TEMPLATE.format(family_id=""),
+            ],
+        )
+        if status < 0:
+            raise TokenReuseError
+        if status == 0:
+            raise TokenRevokedError
+        return replace(session, family_id=JTI(str(UUID(bytes=family_id))))
+
+    def _add_session_arguments(
+        self, session: Session
+    ) -> Tuple[List[str], List[Union[bytes, int, str]]]:
+        keys: List[str] = [
+            SESSION_TEMPLETE.format(jti=session.jti.value),
+            USER_SESSIONS_TEMPLATE.format(user_id=session.user_id.value),
+            REVOCATION_STREAM,
+        ]
+        args: List[Union[bytes, int, str]] = [
+            self._codec.encode(session),
+            _to_ms(session.expires_at.timestamp()),
+            session.jti.value,
+            self._max_sessions,
+            SESSION_TEMPLETE.format(jti=""),
+            self._revocation_retention,
+        ]
+        return keys, args
+
+    @observe_redis(_SECONDS.labels("get_session"))
     async def get_session(self, jti: JTI) -> Optional[Session]:
+        return await self._get_session(jti)
+
+    async def _get_session(self, jti: JTI) -> Optional[Session]:
+        # Shared by the instrumented methods, so a failure is counted once
         session_key: str = SESSION_TEMPLETE.format(jti=jti.value)
-        data_json: Optional[str] = await self._redis.get(session_key)
+        data: Optional[bytes] = (
+            await self._client_cache.get(session_key)
+            if self._client_cache is not None
+            else await self._redis.get(session_key)
+        )
 
-        if not data_json:
+        if not data:
             return None
 
         try:
-            data: Dict[str, Any] = json.loads(data_json)
-            return self._dict_to_session(data, jti)
-        except (KeyError, ValueError):
+            return self._codec.decode(data, jti)
+        except ValueError:
             return None
 
+    @observe_redis(_SECONDS.labels("get_sessions_by_user_id"))
     async def get_sessions_by_user_id(self, user_id: UserId) -> List[Session]:
         user_sessions_key: str = USER_SESSIONS_TEMPLATE.format(user_id=user_id.value)
 
-        # Get JTIs for the user
-        jtis_bytes: List[bytes] = await self._redis.smembers(user_sessions_key)
-        if not jtis_bytes:
-            return []
-
+        async def read() -> List[Any]:
+            # Drop expired entries and get JTIs of the rest in one round trip
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(user_sessions_key, "-inf", _to_ms(time.time()))
+                pipe.zrange(user_sessions_key, 0, -1)
+                return await pipe.execute()
+
+        _, jtis_bytes = await self._read_index(user_sessions_key, read)
+        return await self._load_sessions(user_sessions_key, jtis_bytes)
+
+    @observe_redis(_SECONDS.labels("get_sessions_page"))
+    async def get_sessions_page(
+        self, user_id: UserId, cursor: int = 0, count: int = 100
+    ) -> Tuple[int, List[Session]]:
+        # One ZSCAN batch of the index, the caller resumes from the cursor
+        # until it is 0 again. Small indexes come back whole in one page.
+        user_sessions_key: str = USER_SESSIONS_TEMPLATE.format(user_id=user_id.value)
+        now_ms: int = _to_ms(time.time())
+
+        async def read() -> List[Any]:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                if cursor == 0:
+                    # Expired entries are dropped once per listing
+                    pipe.zremrangebyscore(user_sessions_key, "-inf", now_ms)
+                pipe.zscan(user_sessions_key, cursor, count=count)
+                return await pipe.execute()
+
+        results: List[Any] = await self._read_index(user_sessions_key, read)
+        next_cursor, members = results[-1]
+        sessions: List[Session] = await self._load_sessions(
+            user_sessions_key,
+            [jti for jti, expires_at in members if expires_at > now_ms],
+        )
+        return next_cursor, sessions
+
+    async def iter_sessions(
+        self, user_id: UserId, page_size: int = 100
+    ) -> AsyncIterator[Session]:
+        # ZSCAN may return a member more than once while the set is resized
+        seen: Set[JTI] = set()
+        cursor: int = 0
+        while True:
+            cursor, sessions = await self.get_sessions_page(user_id, cursor, page_size)
+            for session in sessions:
+                if session.jti not in seen:
+                    seen.add(session.jti)
+                    yield session
+            if cursor == 0:
+                return
+
+    async def _load_sessions(
+        self, user_sessions_key: str, jtis_bytes: Iterable[bytes]
+    ) -> List[Session]:
         # Convert bytes to strings and create session keys
         jtis: List[str] = [jti_bytes.decode() for jti_bytes in jtis_bytes]
+        if not jtis:
+            return []
         session_keys: List[str] = [SESSION_TEMPLETE.format(jti=jti) for jti in jtis]
 
         # Get all sessions in one request
-        sessions_data: List[Optional[str]] = await self._redis.mget(session_keys)
+        sessions_data: List[Optional[bytes]] = await self._redis.mget(session_keys)
 
         sessions: List[Session] = []
-        for jti_str, data_json in zip(jtis, sessions_data):
-            if not data_json:
+        dangling: List[str] = []
+        for jti_str, data in zip(jtis, sessions_data):
+            if not data:
+                dangling.append(jti_str)
                 continue
 
             try:
-                data: Dict[str, Any] = json.loads(data_json)
-                session: Session = self._dict_to_session(data, JTI(jti_str))
-                sessions.append(session)
-            except (KeyError, ValueError):
-                # Delete broken index record
-                await self._redis.srem(user_sessions_key, jti_str)
-                continue
-
-        return sessions
+                sessions.append(self._codec.decode(data, JTI(jti_str)))
+            except ValueError:
+                dangling.append(jti_str)
 
-    async def revoke_session(self, jti: JTI) -> None:
-        session_key: str = SESSION_TEMPLETE.format(jti=jti.value)
+        # Delete expired and broken index records in one request
+        if dangling:
+            await self._redis.zrem(user_sessions_key, *dangling)
 
-        # Get current session data to preserve all fields except is_revoked
-        data_json: Optional[str] = await self._redis.get(session_key)
-        if not data_json:
-            return
+        return sessions
 
+    async def _read_index(
+        self, user_sessions_key: str, read: Callable[[], Awaitable[T]]
+    ) -> T:
         try:
-            data: Dict[str, Any] = json.loads(data_json)
-            data["is_revoked"] = True
+            return await read()
+        except ResponseError as e:
+            if "WRONGTYPE" not in str(e):
+                raise
+
+        # Index written as a plain SET by an older version
+        await self._migrate_index(user_sessions_key)
+        return await read()
+
+    async def _migrate_index(self, user_sessions_key: str) -> int:
+        return await self._migrate_index_script(
+            keys=[user_sessions_key], args=[SESSION_TEMPLETE.format(jti="")]
+        )
 
-            # Update with same TTL
-            ttl: int = await self._redis.ttl(session_key)
-            if ttl > 0:
-                await self._redis.setex(session_key, ttl, json.dumps(data))
-        except (KeyError, ValueError):
-            # If data is corrupted, just delete the session
-            await self._redis.delete(session_key)
+    @observe_redis(_SECONDS.labels("revoke_session"))
+    async def revoke_session(self, jti: JTI) -> None:
+        await self._revoke_session_script(
+            keys=[SESSION_TEMPLETE.format(jti=jti.value), REVOCATION_STREAM],
+            args=[self._revocation_retention, jti.value],
+        )
 
+    @observe_redis(_SECONDS.labels("revoke_all_sessions"))
     async def revoke_all_sessions(self, user_id: UserId) -> None:
-        sessions: List[Session] = await self.get_sessions_by_user_id(user_id)
-        for session in sessions:
-            await self.revoke_session(session.jti)
+        await self._revoke_all_sessions_script(
+            keys=[
+                USER_SESSIONS_TEMPLATE.format(user_id=user_id.value),
+                REVOCATION_STREAM,
+            ],
+            args=[
+                SESSION_TEMPLETE.format(jti=""),
+                self._revocation_retention,
+                str(user_id.value),
+            ],
+        )
 
+    @observe_redis(_SECONDS.labels("is_active"))
     async def is_active(self, jti: JTI) -> bool:
-        session: Optional[Session] = await self.get_session(jti)
+        session: Optional[Session] = await self._get_session(jti)
         return session.is_active() if session else False
 
-    async def cleanup_expired_sessions(self) -> None:
-        # Get all index keys
-        index_keys_bytes: List[bytes] = await self._redis.keys(
-            USER_SESSIONS_TEMPLATE.format("*")
+    @observe_redis(_SECONDS.labels("are_active"))
+    async def are_active(self, jtis: Sequence[JTI]) -> List[bool]:
+        if not jtis:
+            return []
+
+        session_keys: List[str] = [
+            SESSION_TEMPLETE.format(jti=jti.value) for jti in jtis
+        ]
+        sessions_data: List[Optional[bytes]] = await self._redis.mget(session_keys)
+
+        active: List[bool] = []
+        for jti, data in zip(jtis, sessions_data):
+            if not data:
+                active.append(False)
+                continue
+            try:
+                active.append(self._codec.decode(data, jti).is_active())
+            except ValueError:
+                active.append(False)
+        return active
+
+    @observe_redis(_SECONDS.labels("cleanup_expired_sessions"))
+    async def cleanup_expired_sessions(
+        self, cursor: int = 0, count: int = 500
+    ) -> Tuple[int, int]:
+        # Walk one SCAN batch of index keys, the caller resumes from the cursor
+        next_cursor, index_keys_bytes = await self._redis.scan(
+            cursor, match=USER_SESSIONS_TEMPLATE.format(user_id="*"), count=count
         )
+        if not index_keys_bytes:
+            return next_cursor, 0
+
         index_keys: List[str] = [key.decode() for key in index_keys_bytes]
+        now_ms: int = _to_ms(time.time())
 
-        for index_key in index_keys:
-            # Get JTIs from the index
-            jtis_bytes: List[bytes] = await self._redis.smembers(index_key)
-            jtis: List[str] = [jti.decode() for jti in jtis_bytes]
+        # Drop expired entries of every index in one round trip
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for index_key in index_keys:
+                pipe.zremrangebyscore(index_key, "-inf", now_ms)
+            results: List[Any] = await pipe.execute(raise_on_error=False)
 
-            if not jtis:
-                continue
+        removed: int = 0
+        for index_key, result in zip(index_keys, results):
+            if isinstance(result, ResponseError):
+                if "WRONGTYPE" not in str(result):
+                    raise result
+                removed += await self._migrate_index(index_key)
+            else:
+                removed += result
+
+        return next_cursor, removed
 
-            # Create session keys and check existence
-            session_keys: List[str] = [SESSION_TEMPLETE.format(jti=jti) for jti in jtis]
-            exists_results: List[bool] = await self._redis.exists(*session_keys)
-
-            # Remove non-existent sessions from index
-            for jti, exists in zip(jtis, exists_results):
-                if not exists:
-                    await self._redis.srem(index_key, jti)
-
-    def _session_to_dict(self, session: Session) -> Dict[str, Any]:
-        return {
-            "user_id": session.user_id.value,
-            "created_at": session.created_at.isoformat(),
-            "expires_at": session.expires_at.isoformat(),
-            "device_info": session.device_info,
-            "ip_address": session.ip_address,
-            "user_agent": session.user_agent,
-            "is_revoked": session.is_revoked,
-        }
-
-    def _dict_to_session(self, data: Dict[str, Any], jti: JTI) -> Session:
-        return Session(
-            jti=jti,
-            user_id=UserId(data["user_id"]),
-            created_at=datetime.fromisoformat(data["created_at"]),
-            expires_at=datetime.fromisoformat(data["expires_at"]),
-            device_info=data["device_info"],
-            ip_address=data["ip_address"],
-            user_agent=data["user_agent"],
-            is_revoked=data["is_revoked"],
-        )
 
-    def _calculate_ttl(self, session: Session) -> int:
-        return int((session.expires_at - datetime.now(timezone.utc)).total_seconds())
+def _to_ms(timestamp: float) -> int:
+    return int(timestamp * 1000)
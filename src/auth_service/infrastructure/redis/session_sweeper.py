@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+import uuid
+from logging import Logger
+from typing import Optional
+
+from aioredis import Redis
+from aioredis.client import Script
+
+from auth_service.core.configurations import RedisConfig
+from auth_service.domain.repositories import AbstractSessionRepository
+from auth_service.infrastructure.redis.scripts import (
+    HOLD_LOCK_SCRIPT,
+    RELEASE_LOCK_SCRIPT,
+)
+
+# Held by the one worker that sweeps, the others stand by
+SWEEPER_LOCK = "session_sweeper:lock"
+
+
+class ExpiredSessionSweeper:
+    def __init__(
+        self,
+        repository: AbstractSessionRepository,
+        config: RedisConfig,
+        redis: Optional[Redis] = None,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        self._repository: AbstractSessionRepository = repository
+        self._scan_count: int = config.sweep_scan_count
+        self._interval: float = config.sweep_interval
+        self._time_budget: float = config.sweep_time_budget
+        self._logger: Logger = logger or logging.getLogger(__name__)
+        self._cursor: int = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+        # Without Redis every sweeper runs, e.g. a single process
+        self._redis: Optional[Redis] = redis
+        self._token: str = uuid.uuid4().hex
+        # Renewed every pass, outlives a missed renewal
+        self._lock_ttl: int = int(
+            max(config.sweep_lock_ttl, 2 * (self._interval + self._time_budget))
+            * 1000
+        )
+        self._hold_lock_script: Optional[Script] = None
+        self._release_lock_script: Optional[Script] = None
+        if redis is not None:
+            self._hold_lock_script = redis.register_script(HOLD_LOCK_SCRIPT)
+            self._release_lock_script = redis.register_script(RELEASE_LOCK_SCRIPT)
+        self.is_leader: bool = redis is None
+
+        self.removed: int = 0
+        self.completed_cycles: int = 0
+
+    async def sweep(self) -> int:
+        # Process SCAN batches until the time budget runs out,
+        # the next pass resumes from the saved cursor
+        deadline: float = time.monotonic() + self._time_budget
+        removed: int = 0
+
+        while True:
+            self._cursor, batch_removed = (
+                await self._repository.cleanup_expired_sessions(
+                    self._cursor, self._scan_count
+                )
+            )
+            removed += batch_removed
+
+            if self._cursor == 0:
+                self.completed_cycles += 1
+                break
+            if time.monotonic() >= deadline:
+                break
+
+        self.removed += removed
+        return removed
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        # Lets a standby worker take over without waiting for the TTL
+        if self._release_lock_script is not None and self.is_leader:
+            try:
+                await self._release_lock_script(
+                    keys=[SWEEPER_LOCK], args=[self._token]
+                )
+            except Exception as e:
+                self._logger.warning("Failed to release the sweeper lock: %s", e)
+            self.is_leader = False
+
+    async def _elect(self) -> bool:
+        if self._hold_lock_script is None:
+            return True
+        is_leader: bool = bool(
+            await self._hold_lock_script(
+                keys=[SWEEPER_LOCK], args=[self._token, self._lock_ttl]
+            )
+        )
+        if is_leader and not self.is_leader:
+            self._logger.info("Session sweeper elected")
+        elif self.is_leader and not is_leader:
+            # Another worker took over, its pass starts from the beginning
+            self._logger.info("Session sweeper lock lost")
+            self._cursor = 0
+        self.is_leader = is_leader
+        return is_leader
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not await self._elect():
+                    await asyncio.sleep(self._interval)
+                    continue
+                removed: int = await self.sweep()
+                if removed:
+                    self._logger.debug("Removed %d expired session entries", removed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error("Expired session sweep failed: %s", e)
+            await asyncio.sleep(self._interval)
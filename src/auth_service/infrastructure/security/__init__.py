@@ -1,9 +1,30 @@
 # Auto-generated __init__.py
 
-from . import jwt_service
-from . import password_service
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from . import jwt_service
+    from . import key_ring
+    from . import password_service
+    from . import revocation_denylist
+    from . import token_cache
 
 __all__ = [
     "jwt_service",
+    "key_ring",
     "password_service",
+    "revocation_denylist",
+    "token_cache",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Submodules are imported on first access, not with the package
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(__all__)
@@ -1,17 +1,49 @@
+import json
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from uuid import UUID, uuid4
 
 import jwt as pyjwt
 from jwt import ExpiredSignatureError, PyJWTError
+from jwt.utils import base64url_encode
 
 from auth_service.core.configurations import JWTConfig
 from auth_service.domain.exceptions.token import (
+    TokenError,
     TokenExpiredError,
     TokenInvalidError,
     TokenRevokedError,
+    TokenTypeError,
 )
 from auth_service.domain.repositories import AbstractSessionRepository
-from auth_service.domain.value_objects import JTI, JWTPayload, TokenType, UserId
+from auth_service.domain.value_objects import (
+    JTI,
+    JWTPayload,
+    Session,
+    TokenPair,
+    TokenType,
+    UserId,
+)
+from auth_service.infrastructure.metrics.registry import (
+    REGISTRY,
+    Histogram,
+    observe,
+    observe_async,
+)
+from auth_service.infrastructure.security.key_ring import KeyRing, SigningKey
+from auth_service.infrastructure.security.revocation_denylist import (
+    RevocationDenylist,
+)
+from auth_service.infrastructure.security.token_cache import TokenCache
+
+_SECONDS: Histogram = REGISTRY.histogram(
+    "auth_jwt_seconds", "JWT encode/decode latency", ["operation"]
+)
+
+# Dict lookup is several times cheaper than calling the enum
+_TOKEN_TYPES: Dict[str, TokenType] = {
+    token_type.value: token_type for token_type in TokenType
+}
 
 
 class JWTService:
@@ -19,12 +51,18 @@ class JWTService:
         self,
         config: JWTConfig,
         session_repository: AbstractSessionRepository,
+        token_cache: Optional[TokenCache] = None,
+        key_ring: Optional[KeyRing] = None,
+        revocation_denylist: Optional[RevocationDenylist] = None,
     ) -> None:
-        self._secret_key: str = config.secret_key
-        self._algorithm: str = config.algorithm
+        self._key_ring: KeyRing = key_ring or KeyRing(config)
         self._access_token_expires_in: int = config.access_token_expires_in
         self._refresh_token_expires_in: int = config.refresh_token_expires_in
         self._session_repository: AbstractSessionRepository = session_repository
+        self._token_cache: Optional[TokenCache] = token_cache
+        self._revocation_denylist: Optional[RevocationDenylist] = (
+            revocation_denylist if config.stateless_access_tokens else None
+        )
 
     def create_access_token(self, user_id: UserId, jti: JTI) -> str:
         return self._create_token(
@@ -36,12 +74,164 @@ class JWTService:
             user_id, jti, TokenType.REFRESH, self._refresh_token_expires_in
         )
 
-    async def decode_token(self, token: str) -> Dict[str, Any]:
+    @observe_async(_SECONDS.labels("issue"))
+    async def issue_token_pair(
+        self,
+        user_id: UserId,
+        device_info: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> Tuple[TokenPair, Session]:
+        now: datetime = datetime.now(timezone.utc)
+        token_pair, session = self._build_token_pair(
+            user_id,
+            now,
+            self._key_ring.get_signing_key(now),
+            device_info,
+            ip_address,
+            user_agent,
+        )
+        await self._session_repository.add(session)
+        return token_pair, session
+
+    @observe_async(_SECONDS.labels("issue_batch"))
+    async def issue_token_pairs(
+        self, user_ids: Sequence[UserId]
+    ) -> List[Tuple[TokenPair, Session]]:
+        # One timestamp, signing key and session write for the whole batch
+        now: datetime = datetime.now(timezone.utc)
+        key: SigningKey = self._key_ring.get_signing_key(now)
+        issued: List[Tuple[TokenPair, Session]] = [
+            self._build_token_pair(user_id, now, key) for user_id in user_ids
+        ]
+        if issued:
+            await self._session_repository.add_many(
+                [session for _, session in issued]
+            )
+        return issued
+
+    @observe_async(_SECONDS.labels("rotate"))
+    async def rotate_refresh_token(
+        self,
+        refresh_token: str,
+        device_info: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> Tuple[TokenPair, Session]:
+        payload: JWTPayload = self._verify_signature(refresh_token)
+        if payload.type is not TokenType.REFRESH:
+            raise TokenTypeError(TokenType.REFRESH, payload.type)
+
+        now: datetime = datetime.now(timezone.utc)
+        token_pair, session = self._build_token_pair(
+            payload.sub,
+            now,
+            self._key_ring.get_signing_key(now),
+            device_info,
+            ip_address,
+            user_agent,
+        )
+        # Checks and revokes the old session, TokenReuseError if it was
+        # already rotated
+        session = await self._session_repository.rotate(payload.jti, session)
+        return token_pair, session
+
+    @observe_async(_SECONDS.labels("decode"))
+    async def decode_token(self, token: str) -> JWTPayload:
+        generation: Optional[int] = None
+        if self._token_cache is not None:
+            cached_payload: Optional[JWTPayload] = self._token_cache.get(token)
+            if cached_payload is not None:
+                return cached_payload
+            generation = self._token_cache.generation
+
+        parsed_payload: JWTPayload = self._verify_signature(token)
+
+        # Check is token revoked
+        denylist: Optional[RevocationDenylist] = self._get_denylist(parsed_payload)
+        if denylist is not None:
+            if denylist.is_revoked(parsed_payload):
+                raise TokenRevokedError
+        elif not await self._session_repository.is_active(parsed_payload.jti):
+            raise TokenRevokedError
+
+        if self._token_cache is not None:
+            # Not cached if a revocation arrived during the session lookup
+            self._token_cache.set(token, parsed_payload, generation)
+
+        return parsed_payload
+
+    @observe_async(_SECONDS.labels("decode_batch"))
+    async def decode_tokens(
+        self, tokens: Sequence[str]
+    ) -> List[Union[JWTPayload, TokenError]]:
+        results: Dict[int, Union[JWTPayload, TokenError]] = {}
+        # Tokens that passed signature checks and still need a session lookup
+        pending: List[Tuple[int, JWTPayload]] = []
+        generation: Optional[int] = (
+            self._token_cache.generation if self._token_cache is not None else None
+        )
+
+        for index, token in enumerate(tokens):
+            if self._token_cache is not None:
+                cached_payload: Optional[JWTPayload] = self._token_cache.get(token)
+                if cached_payload is not None:
+                    results[index] = cached_payload
+                    continue
+            try:
+                payload: JWTPayload = self._verify_signature(token)
+            except TokenError as e:
+                results[index] = e
+                continue
+
+            denylist: Optional[RevocationDenylist] = self._get_denylist(payload)
+            if denylist is None:
+                pending.append((index, payload))
+            elif denylist.is_revoked(payload):
+                results[index] = TokenRevokedError()
+            else:
+                results[index] = payload
+                if self._token_cache is not None:
+                    self._token_cache.set(token, payload, generation)
+
+        if pending:
+            # Check all sessions in one round trip
+            active: List[bool] = await self._session_repository.are_active(
+                [payload.jti for _, payload in pending]
+            )
+            for (index, pending_payload), is_active in zip(pending, active):
+                if not is_active:
+                    results[index] = TokenRevokedError()
+                    continue
+                results[index] = pending_payload
+                if self._token_cache is not None:
+                    self._token_cache.set(
+                        tokens[index], pending_payload, generation
+                    )
+
+        return [results[index] for index in range(len(tokens))]
+
+    def get_jwks(self) -> Dict[str, Any]:
+        return self._key_ring.get_jwks()
+
+    def _get_denylist(self, payload: JWTPayload) -> Optional[RevocationDenylist]:
+        # Only access tokens skip the session lookup, and only while in sync
+        if (
+            self._revocation_denylist is not None
+            and payload.type is TokenType.ACCESS
+            and self._revocation_denylist.is_fresh()
+        ):
+            return self._revocation_denylist
+        return None
+
+    def _verify_signature(self, token: str) -> JWTPayload:
         try:
+            header: Dict[str, Any] = pyjwt.get_unverified_header(token)
+            key: SigningKey = self._key_ring.get_verification_key(header.get("kid"))
             payload: Any = pyjwt.decode(
                 token,
-                self._secret_key,
-                algorithms=[self._algorithm],
+                key.verifying_key,
+                algorithms=[key.algorithm],
                 options={"verify_exp": True},
             )
         except ExpiredSignatureError:
@@ -49,42 +239,86 @@ class JWTService:
         except PyJWTError as e:
             raise TokenInvalidError from e
 
-        parsed_payload: Dict[str, Any] = self._parse_payload_values(payload)
-
-        # Check is token revoked
-        if not await self._session_repository.is_active(parsed_payload["jti"]):
-            raise TokenRevokedError
-
-        return parsed_payload
+        return self._parse_payload_values(payload)
 
+    @observe(_SECONDS.labels("encode"))
     def _create_token(
         self, user_id: UserId, jti: JTI, token_type: TokenType, expires_in: int
     ) -> str:
+        now: datetime = datetime.now(timezone.utc)
         payload = JWTPayload(
             sub=user_id,
             jti=jti,
             type=token_type,
-            exp=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
-            iat=datetime.now(timezone.utc),
+            exp=now + timedelta(seconds=expires_in),
+            iat=now,
         )
-        return pyjwt.encode(
-            payload.to_dict(), self._secret_key, algorithm=self._algorithm
+        return self._encode(payload.to_dict(), self._key_ring.get_signing_key(now))
+
+    def _build_token_pair(
+        self,
+        user_id: UserId,
+        now: datetime,
+        key: SigningKey,
+        device_info: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> Tuple[TokenPair, Session]:
+        jti: JTI = JTI(str(uuid4()))
+        issued_at: float = now.timestamp()
+
+        # Both tokens share the claims but the type and expiry
+        claims: Dict[str, Any] = {
+            "sub": str(user_id),
+            "jti": jti.value,
+            "iat": issued_at,
+        }
+        access_token: str = self._encode(
+            {
+                **claims,
+                "type": TokenType.ACCESS.value,
+                "exp": issued_at + self._access_token_expires_in,
+            },
+            key,
+        )
+        refresh_token: str = self._encode(
+            {
+                **claims,
+                "type": TokenType.REFRESH.value,
+                "exp": issued_at + self._refresh_token_expires_in,
+            },
+            key,
+        )
+
+        session = Session(
+            jti=jti,
+            user_id=user_id,
+            created_at=now,
+            expires_at=now + timedelta(seconds=self._refresh_token_expires_in),
+            device_info=device_info,
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
+        return TokenPair(access_token, refresh_token), session
+
+    def _encode(self, claims: Dict[str, Any], key: SigningKey) -> str:
+        # Compact JWS with the cached header, same output as pyjwt.encode
+        signing_input: bytes = (
+            self._key_ring.get_encoded_header(key)
+            + b"."
+            + base64url_encode(json.dumps(claims, separators=(",", ":")).encode())
         )
+        signature: bytes = self._key_ring.sign(key, signing_input)
+        return (signing_input + b"." + base64url_encode(signature)).decode()
 
-    def _parse_payload_values(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_payload_values(self, payload: Dict[str, Any]) -> JWTPayload:
         try:
-            jti = JTI(payload["jti"])
-            token_type = TokenType(payload["type"])
-            user_id = UserId(payload["sub"])
-            exp: datetime = datetime.fromtimestamp(payload["exp"], timezone.utc)
-            iat: datetime = datetime.fromtimestamp(payload["iat"], timezone.utc)
-        except (ValueError, TypeError) as e:
+            return JWTPayload(
+                sub=UserId(UUID(payload["sub"])),
+                jti=JTI(payload["jti"]),
+                type=_TOKEN_TYPES[payload["type"]],
+                exp=datetime.fromtimestamp(payload["exp"], timezone.utc),
+                iat=datetime.fromtimestamp(payload["iat"], timezone.utc),
+            )
+        except (KeyError, ValueError, TypeError) as e:
             raise TokenInvalidError from e
-
-        return {
-            "sub": user_id,
-            "jti": jti,
-            "type": token_type,
-            "exp": exp,
-            "iat": iat,
-        }
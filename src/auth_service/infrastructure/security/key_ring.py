@@ -0,0 +1,163 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from jwt.algorithms import Algorithm, HMACAlgorithm, get_default_algorithms
+from jwt.utils import base64url_encode
+
+from auth_service.core.configurations import JWTConfig, SigningKeyConfig
+from auth_service.domain.exceptions.token import TokenInvalidError
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: Optional[str]
+    algorithm: str
+    # Parsed key objects, prepared once and reused for every encode/decode
+    signing_key: Optional[Any]
+    verifying_key: Any
+    not_before: Optional[datetime] = None
+    not_after: Optional[datetime] = None
+
+    def can_sign(self, now: datetime) -> bool:
+        if self.signing_key is None:
+            return False
+        if self.not_before is not None and now < self.not_before:
+            return False
+        return self.can_verify(now)
+
+    def can_verify(self, now: datetime) -> bool:
+        return self.not_after is None or now < self.not_after
+
+
+class KeyRing:
+    def __init__(self, config: JWTConfig) -> None:
+        self._algorithms: Dict[str, Algorithm] = get_default_algorithms()
+        self._keys: Dict[Optional[str], SigningKey] = {}
+
+        for key_config in config.signing_keys:
+            self._keys[key_config.kid] = self._load_key(key_config)
+
+        # Tokens without `kid` are signed with the shared secret
+        if config.secret_key:
+            self._keys[None] = SigningKey(
+                kid=None,
+                algorithm=config.algorithm,
+                signing_key=config.secret_key.encode(),
+                verifying_key=config.secret_key.encode(),
+            )
+
+        if not self._keys:
+            raise ValueError("JWT secret key or signing keys must be configured")
+
+        # Newest keys first, the shared secret is the last resort for signing
+        self._signing_order: List[SigningKey] = sorted(
+            self._keys.values(),
+            key=lambda key: (
+                key.kid is not None,
+                key.not_before or datetime.min.replace(tzinfo=timezone.utc),
+            ),
+            reverse=True,
+        )
+        self._jwks: Optional[Dict[str, Any]] = None
+        self._jwks_expires_at: Optional[datetime] = None
+        # Encoded JWS headers by kid, they never change for a given key
+        self._headers: Dict[Optional[str], bytes] = {}
+
+    def get_signing_key(self, now: Optional[datetime] = None) -> SigningKey:
+        now = now or datetime.now(timezone.utc)
+        for key in self._signing_order:
+            if key.can_sign(now):
+                return key
+        raise RuntimeError("No JWT signing key is currently active")
+
+    def get_verification_key(
+        self, kid: Optional[str], now: Optional[datetime] = None
+    ) -> SigningKey:
+        key: Optional[SigningKey] = self._keys.get(kid)
+        if key is None or not key.can_verify(now or datetime.now(timezone.utc)):
+            raise TokenInvalidError
+        return key
+
+    def get_encoded_header(self, key: SigningKey) -> bytes:
+        header: Optional[bytes] = self._headers.get(key.kid)
+        if header is None:
+            # Same serialisation as PyJWT: sorted keys, compact separators
+            fields: Dict[str, Any] = {"alg": key.algorithm, "typ": "JWT"}
+            if key.kid:
+                fields["kid"] = key.kid
+            header = self._headers[key.kid] = base64url_encode(
+                json.dumps(fields, separators=(",", ":"), sort_keys=True).encode()
+            )
+        return header
+
+    def sign(self, key: SigningKey, signing_input: bytes) -> bytes:
+        return self._algorithms[key.algorithm].sign(signing_input, key.signing_key)
+
+    def get_jwks(self) -> Dict[str, Any]:
+        # Published keys include not yet active ones so verifiers can cache
+        # them before rotation, retired keys disappear at `not_after`
+        now: datetime = datetime.now(timezone.utc)
+        if self._jwks is None or (
+            self._jwks_expires_at is not None and now >= self._jwks_expires_at
+        ):
+            self._jwks = {"keys": self._build_jwks(now)}
+            self._jwks_expires_at = min(
+                (
+                    key.not_after
+                    for key in self._keys.values()
+                    if key.not_after is not None and key.not_after > now
+                ),
+                default=None,
+            )
+        return self._jwks
+
+    def _build_jwks(self, now: datetime) -> List[Dict[str, Any]]:
+        keys: List[Dict[str, Any]] = []
+        for key in self._signing_order:
+            if key.kid is None or not key.can_verify(now):
+                continue
+            jwk: Dict[str, Any] = self._algorithms[key.algorithm].to_jwk(
+                key.verifying_key, as_dict=True
+            )
+            jwk.update({"kid": key.kid, "alg": key.algorithm, "use": "sig"})
+            keys.append(jwk)
+        return keys
+
+    def _load_key(self, key_config: SigningKeyConfig) -> SigningKey:
+        algorithm: Optional[Algorithm] = self._algorithms.get(key_config.algorithm)
+        if algorithm is None or isinstance(algorithm, HMACAlgorithm):
+            raise ValueError(
+                f"Unsupported asymmetric algorithm '{key_config.algorithm}'"
+            )
+
+        signing_key: Optional[Any] = None
+        if key_config.private_key_path:
+            signing_key = algorithm.prepare_key(
+                Path(key_config.private_key_path).read_bytes()
+            )
+
+        if key_config.public_key_path:
+            verifying_key: Any = algorithm.prepare_key(
+                Path(key_config.public_key_path).read_bytes()
+            )
+        elif signing_key is not None:
+            verifying_key = signing_key.public_key()
+        else:
+            raise ValueError(f"Signing key '{key_config.kid}' has no key material")
+
+        return SigningKey(
+            kid=key_config.kid,
+            algorithm=key_config.algorithm,
+            signing_key=signing_key,
+            verifying_key=verifying_key,
+            not_before=self._as_utc(key_config.not_before),
+            not_after=self._as_utc(key_config.not_after),
+        )
+
+    def _as_utc(self, value: Optional[datetime]) -> Optional[datetime]:
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
@@ -1,10 +1,196 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timezone
+from logging import Logger
+from typing import Any, Callable, List, Optional, TypeVar
+
 import bcrypt
 
+from auth_service.core.configurations import PasswordConfig
+from auth_service.domain.entities import User
+from auth_service.domain.exceptions import AuthenticationOverloadedError
+from auth_service.domain.repositories import AbstractUserRepository
+from auth_service.infrastructure.metrics.registry import (
+    REGISTRY,
+    Histogram,
+    observe,
+    observe_async,
+)
+
+T = TypeVar("T")
+
+# Async calls include the time spent queued for a worker
+_SECONDS: Histogram = REGISTRY.histogram(
+    "auth_password_seconds", "Password hashing latency", ["operation"]
+)
+
+
+def _hash_password(password: str, rounds: int) -> str:
+    salt: bytes = bcrypt.gensalt(rounds)
+    return bcrypt.hashpw(password.encode(), salt).decode()
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+
+
+def _get_rounds(hashed_password: str) -> Optional[int]:
+    # Modular crypt format: $2b$<cost>$<salt and hash>
+    parts: List[str] = hashed_password.split("$")
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
 
 class PasswordService:
+    def __init__(
+        self, config: Optional[PasswordConfig] = None, logger: Optional[Logger] = None
+    ) -> None:
+        self._config: PasswordConfig = config or PasswordConfig()
+        self._rounds: int = self._config.rounds
+        self._logger: Logger = logger or logging.getLogger(__name__)
+        self._workers: int = self._config.workers or os.cpu_count() or 1
+        # Running jobs plus the bounded number of jobs allowed to wait for a worker
+        self._capacity: int = self._workers + self._config.max_queue_size
+        # Created lazily so that forked workers don't inherit the pool
+        self._executor: Optional[Executor] = None
+
+        self.in_flight: int = 0
+        self.completed: int = 0
+        self.rejected: int = 0
+        self.total_latency: float = 0.0
+        self.max_latency: float = 0.0
+
+    @observe(_SECONDS.labels("hash"))
     def hash_password(self, password: str) -> str:
-        salt: bytes = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode(), salt).decode()
+        return _hash_password(password, self._rounds)
 
+    @observe(_SECONDS.labels("verify"))
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        return _verify_password(plain_password, hashed_password)
+
+    @observe_async(_SECONDS.labels("hash_async"))
+    async def hash_password_async(self, password: str) -> str:
+        return await self._submit(_hash_password, password, self._rounds)
+
+    @observe_async(_SECONDS.labels("verify_async"))
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        return await self._submit(_verify_password, plain_password, hashed_password)
+
+    async def verify_and_rehash(
+        self,
+        user: User,
+        plain_password: str,
+        repository: AbstractUserRepository,
+    ) -> bool:
+        if not await self.verify_password_async(plain_password, user.hashed_password):
+            return False
+
+        # The plain password is only known here, so outdated hashes are
+        # upgraded on a successful login
+        if self.needs_rehash(user.hashed_password):
+            try:
+                hashed_password: str = await self.hash_password_async(plain_password)
+                await repository.update(
+                    replace(
+                        user,
+                        hashed_password=hashed_password,
+                        updated_at=datetime.now(timezone.utc),
+                    )
+                )
+            except Exception as e:
+                # The login itself succeeded, the next one retries
+                self._logger.warning("Password rehash failed for %s: %s", user.id, e)
+        return True
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # Only weaker hashes are upgraded, so nodes calibrated to different
+        # costs don't rehash the same users back and forth
+        rounds: Optional[int] = _get_rounds(hashed_password)
+        return rounds is not None and rounds < self._rounds
+
+    def calibrate(self, target_latency: Optional[float] = None) -> int:
+        # Picks the highest cost whose hash time fits the target. Each round
+        # doubles the work, so one measurement at a cheap cost is enough to
+        # extrapolate. The result stays within [min_rounds, max_rounds],
+        # however slow or fast the host is.
+        target: Optional[float] = target_latency or self._config.target_latency
+        if target is None:
+            return self._rounds
+
+        measured_rounds: int = self._config.calibration_rounds
+        elapsed: float = min(
+            self._measure(measured_rounds)
+            for _ in range(max(1, self._config.calibration_samples))
+        )
+        calibrated: int = measured_rounds + math.floor(math.log2(target / elapsed))
+        # The floor wins if the two are configured the wrong way round
+        self._rounds = max(
+            self._config.min_rounds, min(self._config.max_rounds, calibrated)
+        )
+
+        self._logger.info(
+            "Calibrated bcrypt cost %d for %.3fs target (cost %d took %.4fs)",
+            self._rounds,
+            target,
+            measured_rounds,
+            elapsed,
+        )
+        return self._rounds
+
+    def _measure(self, rounds: int) -> float:
+        started: float = time.perf_counter()
+        _hash_password("calibration", rounds)
+        return time.perf_counter() - started
+
+    async def _submit(self, func: Callable[..., T], *args: Any) -> T:
+        # Reject before queueing so callers fail fast instead of piling up
+        if self.in_flight >= self._capacity:
+            self.rejected += 1
+            raise AuthenticationOverloadedError
+
+        self.in_flight += 1
+        started: float = time.perf_counter()
+        try:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            latency: float = time.perf_counter() - started
+            self.completed += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._config.executor == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    @property
+    def rounds(self) -> int:
+        return self._rounds
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self._workers)
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.completed if self.completed else 0.0
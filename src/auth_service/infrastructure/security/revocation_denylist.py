@@ -0,0 +1,79 @@
+import time
+from typing import Dict, Optional
+
+from auth_service.domain.value_objects import JWTPayload
+from auth_service.infrastructure.redis.revocation_stream import RevocationSubscriber
+
+
+class RevocationDenylist(RevocationSubscriber):
+    def __init__(
+        self,
+        max_staleness: float = 10.0,
+        access_token_expires_in: int = 3600,
+        prune_interval: float = 60.0,
+    ) -> None:
+        self._max_staleness: float = max_staleness
+        self._access_token_expires_in: int = access_token_expires_in
+        self._prune_interval: float = prune_interval
+
+        # JTI -> expiration timestamp of the revoked session
+        self._revoked_jtis: Dict[str, float] = {}
+        # User ID -> tokens issued at or before this timestamp are revoked
+        self._revoked_users: Dict[str, float] = {}
+
+        self._synced_at: Optional[float] = None
+        self._pruned_at: float = time.monotonic()
+
+    def is_fresh(self) -> bool:
+        return (
+            self._synced_at is not None
+            and time.monotonic() - self._synced_at <= self._max_staleness
+        )
+
+    def is_revoked(self, payload: JWTPayload) -> bool:
+        if payload.jti.value in self._revoked_jtis:
+            return True
+
+        revoked_at: Optional[float] = self._revoked_users.get(str(payload.sub.value))
+        return revoked_at is not None and payload.iat.timestamp() <= revoked_at
+
+    def on_session_revoked(self, jti: str, expires_at: float) -> None:
+        # Access tokens of the session can't outlive one access lifetime
+        now: float = time.time()
+        expires_at = min(expires_at, now + self._access_token_expires_in)
+        if expires_at > now:
+            self._revoked_jtis[jti] = expires_at
+
+    def on_user_revoked(self, user_id: str, revoked_at: float) -> None:
+        # Every token issued before `revoked_at` expires within one access lifetime
+        if revoked_at + self._access_token_expires_in > time.time():
+            self._revoked_users[user_id] = max(
+                revoked_at, self._revoked_users.get(user_id, 0.0)
+            )
+
+    def on_desync(self) -> None:
+        # The listener replays the retained stream, which restores every entry
+        self._synced_at = None
+
+    def on_synced(self) -> None:
+        self._synced_at = time.monotonic()
+        if self._synced_at - self._pruned_at >= self._prune_interval:
+            self.prune()
+
+    def prune(self) -> None:
+        now: float = time.time()
+        self._revoked_jtis = {
+            jti: expires_at
+            for jti, expires_at in self._revoked_jtis.items()
+            if expires_at > now
+        }
+        user_cutoff: float = now - self._access_token_expires_in
+        self._revoked_users = {
+            user_id: revoked_at
+            for user_id, revoked_at in self._revoked_users.items()
+            if revoked_at > user_cutoff
+        }
+        self._pruned_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._revoked_jtis) + len(self._revoked_users)
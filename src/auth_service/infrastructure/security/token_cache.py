@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
+
+from auth_service.domain.value_objects import JWTPayload
+from auth_service.infrastructure.cache.ttl_cache import TTLCache
+from auth_service.infrastructure.redis.revocation_stream import RevocationSubscriber
+
+
+class TokenCache(RevocationSubscriber):
+    def __init__(self, max_size: int = 10000, ttl: float = 60) -> None:
+        self._cache: TTLCache[str, JWTPayload] = TTLCache(
+            max_size, ttl, on_evict=self._forget
+        )
+        # Secondary indexes used to invalidate tokens on revocation events
+        self._tokens_by_jti: Dict[str, Set[str]] = {}
+        self._jtis_by_user: Dict[str, Set[str]] = {}
+        # Bumped by every revocation event, lets callers detect one that
+        # arrived while they were checking a session
+        self.generation: int = 0
+
+    def get(self, token: str) -> Optional[JWTPayload]:
+        return self._cache.get(token)
+
+    def set(
+        self, token: str, payload: JWTPayload, generation: Optional[int] = None
+    ) -> None:
+        # The check may predate a revocation of this very token
+        if generation is not None and generation != self.generation:
+            return
+
+        expires_in: float = (payload.exp - datetime.now(timezone.utc)).total_seconds()
+        self._cache.set(token, payload, ttl=expires_in)
+        if token not in self._cache:
+            return
+
+        jti: str = payload.jti.value
+        user_id: str = str(payload.sub.value)
+        self._tokens_by_jti.setdefault(jti, set()).add(token)
+        self._jtis_by_user.setdefault(user_id, set()).add(jti)
+
+    def on_session_revoked(self, jti: str, expires_at: float) -> None:
+        self.generation += 1
+        for token in list(self._tokens_by_jti.get(jti, ())):
+            self._cache.discard(token)
+
+    def on_user_revoked(self, user_id: str, revoked_at: float) -> None:
+        self.generation += 1
+        for jti in list(self._jtis_by_user.get(user_id, ())):
+            for token in list(self._tokens_by_jti.get(jti, ())):
+                self._cache.discard(token)
+
+    def on_desync(self) -> None:
+        self.generation += 1
+        self._cache.clear()
+
+    def _forget(self, token: str, payload: JWTPayload) -> None:
+        jti: str = payload.jti.value
+        user_id: str = str(payload.sub.value)
+
+        tokens: Optional[Set[str]] = self._tokens_by_jti.get(jti)
+        if tokens is not None:
+            tokens.discard(token)
+            if tokens:
+                return
+            del self._tokens_by_jti[jti]
+
+        jtis: Optional[Set[str]] = self._jtis_by_user.get(user_id)
+        if jtis is not None:
+            jtis.discard(jti)
+            if not jtis:
+                del self._jtis_by_user[user_id]
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+    @property
+    def evictions(self) -> int:
+        return self._cache.evictions
+
+    @property
+    def hit_ratio(self) -> float:
+        return self._cache.hit_ratio
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,32 @@
+import fcntl
+from pathlib import Path
+from typing import IO, Optional
+
+# Held open for the life of the process, closing it frees the slot
+_slot_file: Optional[IO[bytes]] = None
+_slot: Optional[int] = None
+
+
+def claim_worker_slot(directory: str) -> int:
+    # Workers of one server number themselves 0..N-1 by locking a file
+    # each. The OS drops the lock with the process, so a restarted worker
+    # takes over the slot of the one it replaces, with its log file and
+    # metrics snapshot.
+    global _slot, _slot_file
+
+    if _slot is not None:
+        return _slot
+
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    slot: int = 0
+    while True:
+        lock_file: IO[bytes] = open(path / f"worker-{slot}.lock", "wb")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            slot += 1
+            continue
+        _slot_file, _slot = lock_file, slot
+        return slot
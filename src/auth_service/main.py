@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import asynccontextmanager, suppress
+from logging import Logger
+from typing import AsyncIterator, Optional
+
+import uvicorn
+from aioredis import Redis
+from dishka import AsyncContainer, make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+
+from auth_service.core.configurations import AppConfig, Config, load_config
+from auth_service.core.providers import get_providers
+from auth_service.infrastructure.cache.bloom_filter import (
+    BloomFilter,
+    RedisBloomFilter,
+)
+from auth_service.infrastructure.cache.username_filter import (
+    USERNAME_FILTER_GENERATION,
+)
+from auth_service.infrastructure.logging import setup_logging
+from auth_service.infrastructure.metrics.multiprocess import (
+    MultiprocessCollector,
+    clear_snapshots,
+)
+from auth_service.infrastructure.postgresql.database.async_database import (
+    AsyncDatabase,
+)
+from auth_service.infrastructure.postgresql.repositories.user_repository import (
+    SQLAlchemyUserRepository,
+)
+from auth_service.infrastructure.redis.session_sweeper import ExpiredSessionSweeper
+from auth_service.infrastructure.security.jwt_service import JWTService
+from auth_service.infrastructure.security.password_service import PasswordService
+from auth_service.infrastructure.workers import claim_worker_slot
+from auth_service.presentation.api.metrics import router as metrics_router
+from auth_service.presentation.api.v1.router import router as v1_router
+
+logger: Logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    container: AsyncContainer = app.state.dishka_container
+
+    # Runs in the worker process: pools, sockets and background tasks are
+    # all created here, after the fork, and never shared between workers.
+    # Resolving the JWT service also starts the revocation listener.
+    await container.get(JWTService)
+    await container.get(ExpiredSessionSweeper)
+    await container.get(Optional[MultiprocessCollector])
+    filter_task: asyncio.Task[None] = asyncio.create_task(
+        _maintain_username_filter(container)
+    )
+    logger.info("Worker %d started", os.getpid())
+
+    try:
+        yield
+    finally:
+        # Uvicorn has stopped accepting and drained requests by now
+        filter_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await filter_task
+        # Stops background tasks and disposes the pools in reverse order
+        await container.close()
+        logger.info("Worker %d stopped", os.getpid())
+
+
+async def _maintain_username_filter(container: AsyncContainer) -> None:
+    username_filter: Optional[BloomFilter] = await container.get(
+        Optional[BloomFilter]
+    )
+    if username_filter is None:
+        return
+    if isinstance(username_filter, RedisBloomFilter):
+        # Every writer keeps a shared filter current, so it's built once.
+        # The rebuild lock lets only one of the workers that find it
+        # missing do that.
+        if not await username_filter.is_built():
+            await _rebuild_username_filter(container, username_filter)
+        return
+
+    # A local filter is rebuilt whenever a writer outside the server, such
+    # as the bulk importer, marks it stale
+    config: Config = await container.get(Config)
+    redis: Redis = await container.get(Redis)
+    built: bool = False
+    built_generation: Optional[bytes] = None
+    while True:
+        try:
+            generation: Optional[bytes] = await redis.get(
+                USERNAME_FILTER_GENERATION
+            )
+            if not built or generation != built_generation:
+                built = await _rebuild_username_filter(container, username_filter)
+                built_generation = generation
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Failed to check the username filter: %s", e)
+        await asyncio.sleep(config.username_filter.refresh_interval)
+
+
+async def _rebuild_username_filter(
+    container: AsyncContainer, username_filter: BloomFilter
+) -> bool:
+    try:
+        database: AsyncDatabase = await container.get(AsyncDatabase)
+        async with database.session() as session:
+            built: bool = await username_filter.rebuild(
+                SQLAlchemyUserRepository(session).stream_usernames()
+            )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # Until built the filter lets every lookup through
+        logger.error("Failed to build username filter: %s", e)
+        return False
+
+    if built:
+        logger.info("Username filter built")
+    return built
+
+
+def create_app() -> FastAPI:
+    # Called by uvicorn in every worker process
+    config: Config = load_config()
+    worker: Optional[int] = None
+    if config.app.runtime_directory is not None:
+        worker = claim_worker_slot(config.app.runtime_directory)
+    _setup_logging(config, worker)
+
+    app = FastAPI(title="Auth Service", debug=config.app.debug, lifespan=lifespan)
+    app.include_router(v1_router)
+    app.include_router(metrics_router)
+
+    # Providers are lazy, nothing connects until the lifespan resolves them
+    container: AsyncContainer = make_async_container(
+        *get_providers(), context={Config: config}
+    )
+    setup_dishka(container, app)
+    return app
+
+
+def main() -> None:
+    config: Config = load_config()
+    _setup_logging(config)
+
+    if config.password.target_latency is not None:
+        # Measured once before the workers start competing for CPUs,
+        # they read the result from the environment
+        rounds: int = PasswordService(config.password).calibrate()
+        os.environ["PASSWORD_ROUNDS"] = str(rounds)
+        load_config.cache_clear()
+
+    workers: int = _get_workers(config.app)
+    if (
+        workers > 1
+        and config.username_filter.enabled
+        and config.username_filter.backend == "local"
+    ):
+        # Every worker would miss usernames registered through the others
+        sys.exit(
+            "USERNAME_FILTER_BACKEND=local needs a single worker, "
+            "use USERNAME_FILTER_BACKEND=redis or APP_WORKERS=1"
+        )
+
+    temporary_directory: Optional[str] = None
+    if workers > 1 and config.app.runtime_directory is None:
+        # Workers find each other through it, see claim_worker_slot()
+        temporary_directory = tempfile.mkdtemp(prefix="auth_service-")
+        os.environ["APP_RUNTIME_DIRECTORY"] = temporary_directory
+        load_config.cache_clear()
+        config = load_config()
+    if config.app.runtime_directory is not None:
+        clear_snapshots(config.app.runtime_directory)
+
+    try:
+        uvicorn.run(
+            "auth_service.main:create_app",
+            factory=True,
+            host=config.app.host,
+            port=config.app.port,
+            workers=workers,
+            backlog=config.app.backlog,
+            loop="uvloop",
+            timeout_keep_alive=config.app.keep_alive_timeout,
+            timeout_graceful_shutdown=config.app.graceful_timeout,
+            access_log=config.app.debug,
+        )
+    finally:
+        if temporary_directory is not None:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+
+
+def _get_workers(config: AppConfig) -> int:
+    if config.workers:
+        return config.workers
+    # Unlike os.cpu_count(), respects the CPUs this container may use
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _setup_logging(config: Config, worker: Optional[int] = None) -> None:
+    setup_logging(
+        output_to_console=config.logging.console,
+        log_directory=config.logging.directory,
+        backup_count=config.logging.backup_count,
+        log_level=config.logging.level,
+        use_queue=config.logging.queue,
+        json_format=config.logging.format == "json",
+        sampling=config.logging.sampling,
+        rate_limits=config.logging.rate_limits,
+        worker=worker,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from fastapi import APIRouter, Response
+
+from auth_service.infrastructure.metrics.multiprocess import MultiprocessCollector
+from auth_service.infrastructure.metrics.registry import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["metrics"], route_class=DishkaRoute)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(
+    collector: FromDishka[Optional[MultiprocessCollector]],
+) -> Response:
+    # With several workers every one of them reports, whichever answers
+    content: str = collector.render() if collector is not None else REGISTRY.render()
+    return Response(content=content, media_type=CONTENT_TYPE)
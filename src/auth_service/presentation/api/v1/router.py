@@ -0,0 +1,36 @@
+from typing import Any, Dict
+
+from aioredis import Redis
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from fastapi import APIRouter, Response, status
+
+from auth_service.infrastructure.postgresql.database.async_database import (
+    AsyncDatabase,
+)
+from auth_service.infrastructure.security.jwt_service import JWTService
+
+router = APIRouter(prefix="/api/v1", route_class=DishkaRoute)
+
+
+@router.get("/.well-known/jwks.json", tags=["keys"])
+async def jwks(jwt_service: FromDishka[JWTService]) -> Dict[str, Any]:
+    return jwt_service.get_jwks()
+
+
+@router.get("/health", tags=["health"])
+async def health(
+    response: Response,
+    database: FromDishka[AsyncDatabase],
+    redis: FromDishka[Redis],
+) -> Dict[str, bool]:
+    try:
+        redis_ok: bool = bool(await redis.ping())
+    except Exception:
+        redis_ok = False
+    checks: Dict[str, bool] = {
+        "database": await database.health_check(),
+        "redis": redis_ok,
+    }
+    if not all(checks.values()):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return checks